@@ -0,0 +1,45 @@
+# Benchmark of 'import gen_api' in a fresh interpreter, as paid by every short-lived worker
+# run 'python benchmarks/bench_import.py' from the repository root; exits with 1 above --limit
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# dependencies that are only imported by the functions that need them
+DEFERRED = ('pandas', 'requests', 'matplotlib', 'mpl_toolkits')
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import gen_api
+elapsed = time.perf_counter() - start
+loaded = [name for name in {DEFERRED!r} if name in sys.modules]
+print(elapsed, ','.join(loaded))
+"""
+
+def import_time():
+    """Seconds taken by 'import gen_api' in a new process, and the deferred modules it loaded anyway"""
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    elapsed, loaded = output.split(' ')
+    return float(elapsed), [name for name in loaded.strip().split(',') if name]
+
+def main():
+    parser = argparse.ArgumentParser(description='Import time benchmark')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--limit', type=float, default=0.5, help='maximum accepted import time in seconds')
+    args = parser.parse_args()
+
+    results = [import_time() for _ in range(args.repeat)]
+    best = min(elapsed for elapsed, _ in results)
+    loaded = results[0][1]
+    print(f'import gen_api: {best:.3f} s (best of {args.repeat})')
+    if loaded:
+        print(f"deferred dependencies imported at startup: {', '.join(loaded)}")
+    if best > args.limit or loaded:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+# Throughput benchmark of the public functions on synthetic inputs, compared with a stored baseline
+# run 'python benchmarks/bench_suite.py' from the repository root; exits with 1 on a regression
+# 'python benchmarks/bench_suite.py --save' records the results of this machine in benchmarks/baseline.json
+# everything runs offline: the AlphaFold cases talk to the local stub server of tests/alphafold_stub.py
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import gen_api
+from gen_api import _core
+from tests import alphafold_stub
+
+BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+SIZES = {'1kb': 10**3, '100kb': 10**5, '1Mb': 10**6, '10Mb': 10**7, '100Mb': 10**8}
+DEFAULT_SIZES = ['1kb', '100kb', '1Mb']
+RECORD = 1000  # length of each sequence given to iterate
+
+# sequence cases: name -> function(inputs) returning the callable to time; throughput is in bases per second
+def _dna2rna(inputs):
+    return lambda: gen_api.api.dna2rna(inputs['dna'])
+
+def _rna2amino(inputs):
+    return lambda: gen_api.api.rna2amino(inputs['rna'])
+
+def _dna2amino(inputs):
+    return lambda: gen_api.api.dna2amino(inputs['dna'])
+
+def _compare(inputs):
+    return lambda: gen_api.api.compare(inputs['dna'], inputs['copy'])
+
+def _find(inputs):
+    return lambda: gen_api.api.find(inputs['dna'], inputs['dna'][-12:])
+
+def _check_codon(inputs):
+    return lambda: gen_api.api.check_codon(inputs['dna'])
+
+def _createmutation(inputs):
+    return lambda: gen_api.api.createmutation(inputs['dna'])
+
+def _cut_repair(inputs):
+    dna = inputs['dna']
+    return lambda: gen_api.api.repair_dna(gen_api.api.cut_dna(dna, len(dna) // 2), 'HDR', repair_sequence='GGATCC')
+
+def _iterate(inputs):
+    # streamed to CSV so that the largest sizes do not build a DataFrame in memory
+    dna, directory = inputs['dna'], inputs['directory']
+    records = [dna[i:i + RECORD] for i in range(0, len(dna), RECORD)]
+    return lambda: gen_api.api.iterate(records, ['dna2rna', 'dna2amino'], filepath=directory, filename='bench.csv', stream=True)
+
+SEQUENCE_CASES = {'dna2rna': _dna2rna, 'rna2amino': _rna2amino, 'dna2amino': _dna2amino, 'compare': _compare,
+                  'find': _find, 'check_codon': _check_codon, 'createmutation': _createmutation,
+                  'cut_dna/repair_dna': _cut_repair, 'iterate': _iterate}
+
+# AlphaFold cases do not depend on the sequence size: throughput is in requests (or atoms) per second
+PREDICTIONS = 50
+ATOMS = 10000
+
+def _coding_rna(length, rng):
+    """Random RNA made of sense codons only, so that translation runs to the end instead of the first STOP"""
+    sense = [codon for codon in _core.CODONS if _core.CODON_CATALOG[codon] != 'STOP']
+    table = np.frombuffer(''.join(sense).encode('ascii'), dtype=np.uint8).reshape(-1, 3)
+    codons = table[rng.integers(0, len(sense), size=-(-length // 3))]
+    return codons.tobytes()[:length].decode('ascii')
+
+def make_inputs(length, directory, seed=0):
+    rng = np.random.default_rng(seed)
+    rna = _coding_rna(length // 3 * 3, rng)
+    dna = rna.translate(str.maketrans('ACGU', 'TGCA'))
+    # a single difference in the last base, so compare has to read both sequences to the end
+    copy = dna[:-1] + ('A' if dna[-1] != 'A' else 'C')
+    return {'dna': dna, 'rna': rna, 'copy': copy, 'directory': directory}
+
+def _synthetic_pdb(atoms, rng):
+    names = ('N', 'CA', 'C', 'O')
+    lines = [f'ATOM  {i % 100000:5d}  {names[i % 4]:<3s} ALA A{i // 4 % 10000:4d}    '
+             f'{x:8.3f}{y:8.3f}{z:8.3f}  1.00{plddt:6.2f}           C'
+             for i, (x, y, z, plddt) in enumerate(zip(*(rng.random((3, atoms)) * 80), rng.random(atoms) * 100))]
+    return ('\n'.join(lines) + '\nEND\n').encode('ascii')
+
+def alphafold_cases(directory):
+    """Times the AlphaFold paths against the local stub; returns {name: (seconds, amount, unit)}"""
+    server, api_url = alphafold_stub.start(_synthetic_pdb(ATOMS, np.random.default_rng(0)))
+    ids = [f'P{i:05d}' for i in range(PREDICTIONS)]
+    results = {}
+    try:
+        # every run uses a new cache, so each prediction is a real (local) HTTP request
+        gen_api.fetch.configure(cache_dir=tempfile.mkdtemp(dir=directory), api_url=api_url)
+        # a first request and a first image outside the timings, for the imports of requests and matplotlib
+        warmup = gen_api.api.alphafold_prediction('WARMUP')
+        gen_api.api.generate_protein(warmup, filepath=None, image=os.path.join(directory, 'warmup.png'), detail='ca')
+        start = time.perf_counter()
+        predictions = [gen_api.api.alphafold_prediction(uniprot_id) for uniprot_id in ids]
+        results['alphafold_prediction'] = (time.perf_counter() - start, PREDICTIONS, 'requests/s')
+
+        client = gen_api.AlphaFoldClient(cache_dir=tempfile.mkdtemp(dir=directory), api_url=api_url)
+        start = time.perf_counter()
+        list(gen_api.fetch_predictions(ids, concurrency=8, rate_limit=10**6, client=client))
+        results['fetch_predictions'] = (time.perf_counter() - start, PREDICTIONS, 'requests/s')
+
+        start = time.perf_counter()
+        gen_api.api.generate_protein(predictions[0], filepath=None, image=os.path.join(directory, 'protein.png'), detail='ca')
+        results['generate_protein'] = (time.perf_counter() - start, ATOMS, 'atoms/s')
+    finally:
+        gen_api.fetch.configure()
+        alphafold_stub.stop(server)
+    return results
+
+def best_of(function, repeat, minimum=0.01):
+    """Best time of one call over repeat runs; fast calls are looped so that each run lasts at least minimum seconds"""
+    start = time.perf_counter()
+    function()
+    first = time.perf_counter() - start
+    number = max(1, int(minimum / first)) if first > 0 else 1000
+    best = first
+    for _ in range(repeat - 1 if number == 1 else repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def run(sizes, cases, repeat, alphafold=True):
+    """Returns {key: (seconds, amount, unit)}, keyed 'case/size' for the sequence cases"""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            inputs = make_inputs(SIZES[size], directory)
+            for case in cases:
+                # large inputs are timed once, the small ones take the best of repeat runs
+                seconds = best_of(SEQUENCE_CASES[case](inputs), 1 if SIZES[size] >= 10**7 else repeat)
+                results[f'{case}/{size}'] = (seconds, len(inputs['dna']), 'bases/s')
+        if alphafold:
+            results.update(alphafold_cases(directory))
+    return results
+
+def regressions(throughputs, baseline, threshold, case_thresholds):
+    """Keys whose throughput fell by more than their threshold (a fraction) below the baseline"""
+    slower = {}
+    for key, throughput in throughputs.items():
+        if key not in baseline:
+            continue
+        limit = case_thresholds.get(key, case_thresholds.get(key.rsplit('/', 1)[0], threshold))
+        if throughput < baseline[key] * (1 - limit):
+            slower[key] = throughput / baseline[key]
+    return slower
+
+def _case_threshold(value):
+    case, _, fraction = value.rpartition('=')
+    if not case:
+        raise argparse.ArgumentTypeError("expected CASE=FRACTION, e.g. dna2rna=0.5 or dna2rna/1Mb=0.5")
+    return case, float(fraction)
+
+def parser():
+    parser = argparse.ArgumentParser(description='Throughput benchmark suite')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, choices=list(SIZES))
+    parser.add_argument('--cases', nargs='+', default=list(SEQUENCE_CASES), choices=list(SEQUENCE_CASES))
+    parser.add_argument('--no-alphafold', action='store_true', help='skip the AlphaFold cases')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=BASELINE, help='JSON file with the reference throughputs')
+    parser.add_argument('--save', action='store_true', help='write the results to --baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help='accepted slowdown as a fraction of the baseline throughput (default 0.5)')
+    parser.add_argument('--case-threshold', type=_case_threshold, action='append', default=[],
+                        help='CASE=FRACTION overriding --threshold for a case or a case/size')
+    return parser
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+
+    results = run(args.sizes, args.cases, args.repeat, not args.no_alphafold)
+    throughputs = {key: amount / seconds for key, (seconds, amount, _) in results.items()}
+
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['throughput']
+
+    print(f"{'case':<34} {'time (s)':>10} {'throughput':>22} {'vs baseline':>12}")
+    for key, (seconds, amount, unit) in results.items():
+        ratio = f'{throughputs[key] / baseline[key]:.2f}x' if key in baseline else '-'
+        print(f'{key:<34} {seconds:>10.3g} {throughputs[key]:>12.3g} {unit:<9} {ratio:>12}')
+
+    if args.save:
+        saved = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                saved = json.load(f)['throughput']
+        saved.update(throughputs)
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'throughput': dict(sorted(saved.items()))}, f, indent=2)
+            f.write('\n')
+        print(f'baseline saved to {args.baseline}')
+        return 0
+
+    if not baseline:
+        print(f'no baseline at {args.baseline}, run with --save to record one')
+        return 0
+    slower = regressions(throughputs, baseline, args.threshold, dict(args.case_threshold))
+    for key, ratio in slower.items():
+        print(f'regression: {key} runs at {ratio:.2f}x of the baseline throughput')
+    return 1 if slower else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# Benchmark of dna2rna: per-character loop (previous implementation) vs table-driven kernel
+# run 'python benchmarks/bench_transcription.py' from the repository root
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gen_api
+
+SIZES = {'1kb': 10**3, '1Mb': 10**6, '100Mb': 10**8}
+
+def legacy_dna2rna(dna):
+    """Previous dna2rna implementation, kept here as the reference point"""
+    rna = ""
+    for base in dna:
+        if base=='A' or base=='a':
+            rna+='U'
+        elif base=='T' or base=='t':
+            rna+='A'
+        elif base=='C' or base=='c':
+            rna+='G'
+        elif base=='G' or base=='g':
+            rna+='C'
+        else:
+            raise ValueError('Could not read provided DNA string')
+    return rna
+
+def best_of(function, argument, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Transcription benchmark')
+    parser.add_argument('--sizes', nargs='+', default=list(SIZES), choices=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'loop (s)':>10} {'table (s)':>10} {'numpy (s)':>10} {'speedup':>8}")
+    for name in args.sizes:
+        dna = ''.join(random.choices('ATCG', k=SIZES[name]))
+        array = np.frombuffer(dna.encode('ascii'), dtype=np.uint8)
+        repeat = 1 if SIZES[name] >= 10**8 else args.repeat
+
+        loop = best_of(legacy_dna2rna, dna, repeat)
+        table = best_of(gen_api.dna2rna, dna, repeat)
+        vectorised = best_of(gen_api.dna2rna, array, repeat)
+        print(f'{name:>6} {loop:>10.4f} {table:>10.4f} {vectorised:>10.4f} {loop / table:>7.0f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+from ._version import __version__
+from .api import *
+from .esp_api import *
+from .cat_api import *
+from .deu_api import *
\ No newline at end of file
@@ -0,0 +1,3 @@
+# tests/__init__.py
+
+# run 'pytest' to perform testing
\ No newline at end of file
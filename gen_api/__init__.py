@@ -1,4 +1,16 @@
 from ._version import __version__
+from .packed import PackedSequence
+from .reader import Record, read_records, read_sequences
+from .orf import ORF, find_orfs, iter_orfs
+from .search import MotifAutomaton, find_many, find_approx
+from .index import SequenceIndex
+from .validate import find_invalid_codons, first_invalid
+from .structure import Structure, parse_pdb, read_pdb
+from .crispr import CutSite, scan_cut_sites
+from .editable import EditableSequence
+from .mutation import Mutations, Generation, create_mutations, evolve
+from .render import level_of_detail, render_structure, render_structures
+from .fetch import AlphaFoldClient, PredictionResult, fetch_predictions
 from .api import *
 from .esp_api import *
 from .cat_api import *
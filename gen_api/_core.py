@@ -0,0 +1,275 @@
+"""Shared sequence kernels used by api.py and the localised modules (esp, cat, deu)"""
+import threading
+from contextlib import contextmanager
+
+def _build_table(pairs):
+    # every byte that is not listed maps to 0, which marks it as invalid
+    table = bytearray(256)
+    for source, target in pairs.items():
+        table[ord(source)] = ord(target)
+    return bytes(table)
+
+# Complementary transcription tables (upper and lower case input, upper case output)
+DNA2RNA_TABLE = _build_table({'A': 'U', 'T': 'A', 'C': 'G', 'G': 'C',
+                              'a': 'U', 't': 'A', 'c': 'G', 'g': 'C'})
+RNA2DNA_TABLE = _build_table({'U': 'A', 'A': 'T', 'G': 'C', 'C': 'G',
+                              'u': 'A', 'a': 'T', 'g': 'C', 'c': 'G'})
+
+# Validation modes: 'strict' accepts only the four bases, 'iupac' also the IUPAC ambiguity codes
+# (complemented on transcription, e.g. R <-> Y) and 'mask' accepts them too but writes them as N
+MODES = ('strict', 'iupac', 'mask')
+IUPAC_COMPLEMENTS = {'R': 'Y', 'Y': 'R', 'S': 'S', 'W': 'W', 'K': 'M', 'M': 'K',
+                     'B': 'V', 'V': 'B', 'D': 'H', 'H': 'D', 'N': 'N'}
+_BASES = {'DNA': 'ACGT', 'RNA': 'ACGU'}
+
+def check_mode(mode):
+    if mode not in MODES:
+        raise ValueError("mode must be 'strict', 'iupac' or 'mask'")
+
+def alphabet(kind, mode='strict'):
+    """The characters (upper and lower case, as bytes) accepted for a 'DNA' or 'RNA' sequence in a mode"""
+    check_mode(mode)
+    letters = _BASES[kind] + ('' if mode == 'strict' else ''.join(IUPAC_COMPLEMENTS))
+    return (letters + letters.lower()).encode('ascii')
+
+_LENIENT_TABLES = {}
+
+def transcription_table(table, mode='strict'):
+    """DNA2RNA_TABLE or RNA2DNA_TABLE extended with the IUPAC codes for the lenient modes"""
+    check_mode(mode)
+    if mode == 'strict':
+        return table
+    if (table, mode) not in _LENIENT_TABLES:
+        extended = bytearray(table)
+        for code, complement in IUPAC_COMPLEMENTS.items():
+            extended[ord(code)] = extended[ord(code.lower())] = ord(complement if mode == 'iupac' else 'N')
+        _LENIENT_TABLES[table, mode] = bytes(extended)
+    return _LENIENT_TABLES[table, mode]
+
+def first_invalid(raw, allowed):
+    """Position of the first byte of raw that is not in allowed, or None.
+
+    bytes.translate with a delete set makes one pass in C and only copies the
+    bytes it keeps, here the invalid ones, so checking a clean sequence adds
+    no copy of raw; the first of them is then found with one index call. A
+    str has to be encoded by as_bytes first, which does copy it once.
+    """
+    invalid = raw.translate(None, allowed)
+    if not invalid:
+        return None
+    return raw.index(invalid[:1])
+
+def as_bytes(seq, error):
+    """Returns the ASCII bytes of a sequence, raising ValueError(error) if it has non-ASCII characters.
+
+    The bytes are a new copy of the sequence, also for bytearray and memoryview.
+    Like every kernel error here, error is formatted with the position of the
+    first invalid character, for messages that have a {} placeholder.
+    """
+    if isinstance(seq, (bytes, bytearray, memoryview)):
+        return bytes(seq)
+    if not isinstance(seq, str):
+        seq = ''.join(seq)
+    try:
+        return seq.encode('ascii')
+    except UnicodeEncodeError as exception:
+        raise ValueError(error.format(exception.start))
+
+_shared = threading.local()
+
+@contextmanager
+def sharing():
+    """Within the block, transcribe and translate reuse their results for the same input string.
+
+    iterate opens one block per input, so that e.g. dna2rna and dna2amino
+    transcribe it only once. Only successful results are kept, so each
+    function still raises its own error message.
+    """
+    previous = getattr(_shared, 'cache', None)
+    _shared.cache = {}
+    try:
+        yield
+    finally:
+        _shared.cache = previous
+
+def _reuse(key, compute):
+    cache = getattr(_shared, 'cache', None)
+    if cache is None or not isinstance(key[-1], str):
+        return compute()
+    if key not in cache:
+        cache[key] = compute()
+    return cache[key]
+
+def transcribe(seq, table, error, mode='strict'):
+    """Translates the whole sequence through a 256-byte table in a single pass"""
+    table = transcription_table(table, mode)
+    return _reuse((table, seq), lambda: _transcribe(seq, table, error))
+
+def _transcribe(seq, table, error):
+    if hasattr(seq, 'dtype'):
+        return transcribe_array(seq, table, error)
+    if hasattr(seq, 'transcribe'):
+        return seq.transcribe(table, error)  # PackedSequence complements its packed buffer directly
+    translated = as_bytes(seq, error).translate(table)
+    # invalid characters were translated to 0, the first one is found without another copy
+    position = translated.find(0)
+    if position != -1:
+        raise ValueError(error.format(position))
+    return translated.decode('ascii')
+
+def transcribe_array(array, table, error, out=None):
+    """NumPy path: translates a uint8 array (e.g. a memory-mapped sequence) without going through str"""
+    import numpy as np
+
+    lut = np.frombuffer(table, dtype=np.uint8)
+    out = np.take(lut, array, out=out)
+    if not out.all():
+        raise ValueError(error.format(int(np.argmin(out))))
+    return out
+
+# Genetic code shared by rna2amino, dna2amino and check_codon
+CODON_CATALOG = {'UUU': 'Phe', 'UUC': 'Phe', 'UUA': 'Leu', 'UUG': 'Leu',
+                 'UCU': 'Ser', 'UCC': 'Ser', 'UCA': 'Ser', 'UCG': 'Ser',
+                 'UAU': 'Tyr', 'UAC': 'Tyr', 'UAA': 'STOP', 'UAG': 'STOP',
+                 'UGU': 'Cys', 'UGC': 'Cys', 'UGA': 'STOP', 'UGG': 'Trp',
+                 'CUU': 'Leu', 'CUC': 'Leu', 'CUA': 'Leu', 'CUG': 'Leu',
+                 'CCU': 'Pro', 'CCC': 'Pro', 'CCA': 'Pro', 'CCG': 'Pro',
+                 'CAU': 'His', 'CAC': 'His', 'CAA': 'Gln', 'CAG': 'Gln',
+                 'CGU': 'Arg', 'CGC': 'Arg', 'CGA': 'Arg', 'CGG': 'Arg',
+                 'AUU': 'Ile', 'AUC': 'Ile', 'AUA': 'Ile', 'AUG': 'Met',
+                 'ACU': 'Thr', 'ACC': 'Thr', 'ACA': 'Thr', 'ACG': 'Thr',
+                 'AAU': 'Asn', 'AAC': 'Asn', 'AAA': 'Lys', 'AAG': 'Lys',
+                 'AGU': 'Ser', 'AGC': 'Ser', 'AGA': 'Arg', 'AGG': 'Arg',
+                 'GUU': 'Val', 'GUC': 'Val', 'GUA': 'Val', 'GUG': 'Val',
+                 'GCU': 'Ala', 'GCC': 'Ala', 'GCA': 'Ala', 'GCG': 'Ala',
+                 'GAU': 'Asp', 'GAC': 'Asp', 'GAA': 'Glu', 'GAG': 'Glu',
+                 'GGU': 'Gly', 'GGC': 'Gly', 'GGA': 'Gly', 'GGG': 'Gly'
+                 }
+
+# 6-bit codon codes: each base is 2 bits (A=0, C=1, G=2, U=3, same order as PackedSequence)
+# and a codon is 16*first + 4*second + third
+INVALID_BASE = 255
+RNA_CODE_TABLE = bytes(INVALID_BASE if chr(i) not in 'ACGU' else 'ACGU'.index(chr(i)) for i in range(256))
+# for the lenient modes: IUPAC ambiguity codes make a codon that is translated as AMBIGUOUS_AMINO
+AMBIGUOUS_BASE = 254
+AMBIGUOUS_AMINO = 'Xaa'
+RNA_AMBIGUOUS_CODE_TABLE = bytes(AMBIGUOUS_BASE if chr(i) in IUPAC_COMPLEMENTS else code for i, code in enumerate(RNA_CODE_TABLE))
+CODONS = [a + b + c for a in 'ACGU' for b in 'ACGU' for c in 'ACGU']
+AMINO_NAMES = sorted(set(CODON_CATALOG.values()) - {'STOP'}) + ['STOP']
+STOP = len(AMINO_NAMES) - 1
+CODON_AMINO = bytes(AMINO_NAMES.index(CODON_CATALOG[codon]) for codon in CODONS)
+# ' Met', ' Val', ... as fixed 4-byte records so a protein can be assembled with one array lookup;
+# the STOP index, which never reaches the output, holds the AMBIGUOUS_AMINO record
+AMINO_RECORDS = b''.join(b' ' + name.encode('ascii') for name in AMINO_NAMES[:-1] + [AMBIGUOUS_AMINO])
+
+# below this many bases the plain loop over CODON_CATALOG beats the NumPy setup cost
+VECTORISE_FROM = 256
+
+def _translate_loop(rna, error, ambiguous=False):
+    amino = []
+    for i in range(0, len(rna)-2, 3):
+        codon = rna[i:i+3]
+        name = CODON_CATALOG.get(codon)
+        if name is None and ambiguous and all(base in 'ACGU' or base in IUPAC_COMPLEMENTS for base in codon):
+            name = AMBIGUOUS_AMINO
+        if name is None:
+            raise ValueError(error.format(codon))
+        if name == 'STOP':
+            break
+        amino.append(name)
+    return ''.join(' ' + name for name in amino)
+
+def translate_codes(codes, rna, error):
+    """Translates an array of 2-bit base codes in one vectorised pass, stopping at the first STOP codon.
+
+    Codons with an AMBIGUOUS_BASE code (see RNA_AMBIGUOUS_CODE_TABLE) are translated as AMBIGUOUS_AMINO.
+    """
+    import numpy as np
+
+    triplets = codes[:len(codes) // 3 * 3].reshape(-1, 3)
+    invalid = (triplets == INVALID_BASE).any(axis=1)
+    unknown = (triplets == AMBIGUOUS_BASE).any(axis=1) & ~invalid
+    index = (triplets[:, 0] << 4 | triplets[:, 1] << 2 | triplets[:, 2]) & 63
+    amino = np.frombuffer(CODON_AMINO, dtype=np.uint8)[index]
+
+    # the scan ends at whichever comes first: an invalid codon (error) or a STOP codon
+    events = np.flatnonzero(invalid | ((amino == STOP) & ~unknown))
+    end = len(amino)
+    if len(events):
+        end = events[0]
+        if invalid[end]:
+            raise ValueError(error.format(str(rna[3*end:3*end+3])))
+    amino = np.where(unknown, STOP, amino)  # the STOP record is AMBIGUOUS_AMINO
+
+    records = np.frombuffer(AMINO_RECORDS, dtype=np.uint8).reshape(-1, 4)
+    return records[amino[:end]].tobytes().decode('ascii')
+
+def translate(rna, error, ambiguous=False):
+    """Returns the amino acids (' Met Val ...') of an RNA sequence; error is formatted with the invalid codon.
+
+    With ambiguous=True a codon with IUPAC ambiguity codes (e.g. NNN) is
+    translated as AMBIGUOUS_AMINO instead of raising.
+    """
+    return _reuse(('translate', ambiguous, rna), lambda: _translate(rna, error, ambiguous))
+
+def _translate(rna, error, ambiguous):
+    if hasattr(rna, 'codes') and rna.kind == 'RNA' and not rna.has_exceptions():
+        return translate_codes(rna.codes(), rna, error)
+    if not isinstance(rna, str):
+        rna = str(rna)
+    if len(rna) < VECTORISE_FROM or not rna.isascii():
+        return _translate_loop(rna, error, ambiguous)
+
+    import numpy as np
+    table = RNA_AMBIGUOUS_CODE_TABLE if ambiguous else RNA_CODE_TABLE
+    codes = np.frombuffer(rna.encode('ascii').translate(table), dtype=np.uint8)
+    return translate_codes(codes, rna, error)
+
+# bases compared per step when only the first difference (or whether there is one) is needed
+COMPARE_BLOCK = 1 << 16
+
+def as_array(seq):
+    """Zero-copy NumPy view of a sequence where possible: uint8 for ASCII, uint32 code points otherwise"""
+    import numpy as np
+
+    if hasattr(seq, 'dtype'):
+        return seq
+    if hasattr(seq, 'to_array'):  # PackedSequence
+        return seq.to_array()
+    if isinstance(seq, (bytes, bytearray, memoryview)):
+        return np.frombuffer(seq, dtype=np.uint8)
+    if not isinstance(seq, str):
+        joined = ''.join(seq)
+        if len(joined) != len(seq):
+            raise TypeError('as_array needs a sequence of single characters')
+        seq = joined
+    if seq.isascii():
+        return np.frombuffer(seq.encode('ascii'), dtype=np.uint8)
+    return np.frombuffer(seq.encode('utf-32-le'), dtype=np.uint32)
+
+def _is_text(seq):
+    return isinstance(seq, (str, bytes, bytearray, memoryview)) or hasattr(seq, 'dtype') or hasattr(seq, 'to_array')
+
+def first_difference(original, copy, block_size=COMPARE_BLOCK):
+    """Index of the first position where the two sequences differ within their common length, or None.
+
+    The sequences are compared block by block, so a difference near the start
+    is found without converting (or even reading) the rest of the input.
+    Other sequences than str, bytes, PackedSequence or arrays (e.g. lists of
+    amino acid names) are compared element by element.
+    """
+    import numpy as np
+
+    length = min(len(original), len(copy))
+    if not (_is_text(original) and _is_text(copy)):
+        return next((i for i in range(length) if original[i] != copy[i]), None)
+    for start in range(0, length, block_size):
+        stop = min(start + block_size, length)
+        a, b = original[start:stop], copy[start:stop]
+        if type(a) is type(b) and isinstance(a, (str, bytes)):
+            if a == b:  # memcmp, no conversion needed
+                continue
+        a, b = as_array(a), as_array(b)
+        if not np.array_equal(a, b):
+            return start + int(np.argmax(a != b))
+    return None
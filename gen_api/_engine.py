@@ -0,0 +1,328 @@
+"""Implementation shared by api.py and the localised modules (esp, cat, deu).
+
+Every function takes a text argument: the message catalog of the calling
+module (see _TEXT in each of them), so the localised modules only map names,
+argument names and messages onto this one implementation.
+"""
+import itertools
+import random
+
+import numpy as np
+
+from . import _core
+from . import batch
+from . import fetch
+from . import reader
+from . import render
+from . import sink
+from . import structure
+from . import validate
+from .crispr import CutSite
+from .editable import EditableSequence
+from .index import SequenceIndex
+from .packed import BLOCK, PackedSequence
+
+def dna2rna(dna, text, mode='strict'):
+    return _core.transcribe(dna, _core.DNA2RNA_TABLE, text['dna'] + text['position'], mode)
+
+def rna2amino(rna, text):
+    return _core.translate(rna, text['codon'])
+
+def dna2amino(dna, text, mode='strict'):
+    rna = _core.transcribe(dna, _core.DNA2RNA_TABLE, text['dna'] + text['position'], mode)
+    # outside 'strict' mode the codons with ambiguity codes (N runs of an assembly) become Xaa
+    return _core.translate(rna, text['codon'], ambiguous=mode != 'strict')
+
+def rna2dna(rna, text, mode='strict'):
+    return _core.transcribe(rna, _core.RNA2DNA_TABLE, text['rna'] + text['position'], mode)
+
+def compare(original, copy, text):
+    if len(original) != len(copy):
+        return text['different_length']
+    difference = _core.first_difference(original, copy)
+    if difference is not None:
+        return text['difference'].format(difference+1)
+    return text['identical']
+
+def identical(original, copy):
+    return len(original) == len(copy) and _core.first_difference(original, copy) is None
+
+def compare_full(original, copy):
+    a, b = _core.as_array(original), _core.as_array(copy)
+    compared = min(len(a), len(b))
+    a, b = a[:compared], b[:compared]
+    positions = np.flatnonzero(a != b)
+
+    # each (original, copy) pair of characters is packed into one integer to count them all at once
+    pairs = a[positions].astype(np.uint64) << np.uint64(32) | b[positions].astype(np.uint64)
+    kinds, counts = np.unique(pairs, return_counts=True)
+    substitutions = {f'{chr(int(pair) >> 32)}>{chr(int(pair) & 0xFFFFFFFF)}': int(count)
+                     for pair, count in zip(kinds, counts)}
+
+    return {'identical': len(positions) == 0 and len(original) == len(copy),
+            'length_original': len(original),
+            'length_copy': len(copy),
+            'length_difference': len(copy) - len(original),
+            'compared': compared,
+            'hamming': len(positions),
+            'positions': positions,
+            'substitutions': substitutions}
+
+def _check_alphabet(string, kind, text, mode):
+    error = text[kind.lower()] + text['position']
+    position = _core.first_invalid(_core.as_bytes(string, error), _core.alphabet(kind, mode))
+    if position is not None:
+        raise ValueError(error.format(position))
+
+def check(string, text, mode='strict'):
+    if len(string)%3 == 0:
+        if string[:3]=='TAC' and (string[-3:]=='ATT' or string[-3:]=='ATC' or string[-3:]=='ACC'):
+            _check_alphabet(string, 'DNA', text, mode)
+            return text['valid_dna']
+        elif string[:3]=='AUG' and (string[-3:]=='UAA' or string[-3:]=='UAG' or string[-3:]=='UGG'):
+            _check_alphabet(string, 'RNA', text, mode)
+            return text['valid_rna']
+        else:
+            raise ValueError(text['no_start_end'])
+    else:
+        raise ValueError(text['not_codons'])
+
+def _input_sequences(path, text):
+    """Generator of the sequences in the file at path, or path itself when it is not a file name"""
+    file_type = reader.file_format(path)
+    if file_type is not None:
+        try:
+            open(path, 'rb').close()
+        except OSError:
+            raise ValueError(text['open_file'])
+        return reader.read_sequences(path, file_type)
+    elif path[-3:]=='pdf' or path[-3:]=='doc' or path[-4:]=='docx' or path[-3:]=='csv' or path[-4:]=='xlsx' or path[-4:]=='html':
+        raise ValueError(text['not_txt'])
+    else:
+        return path
+
+def read_input(path, text):
+    sequences = _input_sequences(path, text)
+    if reader.file_format(path) == 'text':
+        return list(sequences)  # txt files have always been returned as a list
+    return sequences
+
+def createmutation(string):
+    bases = ['A', 'T', 'C', 'G']
+    mutated = ""
+
+    while True:
+        muttype = random.choices([1, 5, 6], weights=[75, 15, 10], k=1)[0] # weighted probabilties for biological reality
+        index = random.randint(0, len(string) - 1)
+
+        if muttype == 1:  # Substitution
+            # Handle transition/transversion probabilities
+            purines = ['A', 'G']
+            pyrimidines = ['C', 'T']
+            if string[index] in purines: # transititions are 2x more likely than transversions
+                new_base = random.choices(purines + pyrimidines, weights=[2, 2, 1, 1], k=1)[0]
+            else:
+                new_base = random.choices(pyrimidines + purines, weights=[2, 2, 1, 1], k=1)[0]
+            mutated = string[:index] + new_base + string[index + 1:]
+        elif muttype == 5:  # Deletion
+            del_length = random.choices([1, 2, 3], weights=[70, 20, 10], k=1)[0] # weighted random selection for length (1–3 bases)
+            del_length = min(del_length, len(string) - index) # avoid index out of range
+            mutated = string[:index] + string[index + del_length:]
+
+        elif muttype == 6:  # Insertion
+            insert_length = random.choices([1, 2, 3], weights=[70, 20, 10], k=1)[0] # weighted random selection for length (1-3 bases)
+            insert_bases = ''.join(random.choices(bases, k=insert_length))
+            mutated = string[:index] + insert_bases + string[index:]
+
+        # Break the loop if the mutation differs from the original
+        if mutated != string:
+            break
+
+    return mutated
+
+def iterate(strings, functions, filepath, filename, text, module, workers=1, executor='process',
+            chunk_size=batch.DEFAULT_CHUNK_SIZE, stream=False, output_format=None):
+    """Function names are looked up in module first (the calling facade), then in the other language modules"""
+    import pandas as pd
+
+    columns = ['input']+[function for function in functions]
+
+    if isinstance(strings, str):
+        if not strings:
+            raise ValueError(text['no_sequences'])
+        # files of every type are read line by line (or record by record) as the rows are processed
+        strings = _input_sequences(strings, text)
+        if isinstance(strings, str):
+            strings = [strings]
+    strings = iter(strings)
+    first = next(strings, None)
+    if first is None:
+        raise ValueError(text['no_sequences'])
+    if not functions:
+        raise ValueError(text['no_functions'])
+    strings = itertools.chain([first], strings)
+    if stream:
+        path = f'{filepath}/{filename}'
+        output = sink.open_sink(path, columns, output_format)
+        try:
+            for chunk, results in batch.run_chunks(strings, columns[1:], module, workers, executor, chunk_size):
+                output.write([chunk] + results)
+        finally:
+            output.close()
+        return path
+
+    data = batch.run(strings, columns[1:], module, workers, executor, chunk_size)
+    df = pd.DataFrame(dict(enumerate(data)))
+    df.columns = columns
+
+    # df.to_csv(filepath.join(filename), index=False)
+    df.to_csv(f'{filepath}/{filename}', index=False)
+    return df
+
+def tosingle(sin):
+    inp = sin.split()
+    sout = ''
+    for base in inp:
+        sout+=base[0]
+    return sout
+
+def alphafold_prediction(uniprot_id, text):
+    status, prediction = fetch.default_client().prediction(uniprot_id)
+    if status == 200:
+        return prediction
+    else:
+        raise ValueError(text['fetch'].format(status))
+
+def generate_protein(structure_dict, filepath, show, text, image=None, detail=None):
+    status, content = fetch.default_client().get(structure_dict['pdbUrl'])
+    if status == 200:
+        if filepath is not None:
+            with open(filepath, 'wb') as f:
+                f.write(content)
+
+        # atoms are parsed from the downloaded bytes, the saved file is not read back
+        protein = structure.parse_pdb(content)
+
+        # with an image path the figure is written headless, without pyplot or a window
+        if image is not None:
+            render.render_structure(protein, image, detail, axes=text['axes'], accuracy=text['accuracy'])
+            return protein
+
+        # pyplot is imported on first use, it makes up most of the import time of gen_api
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=(8,6))
+        render.draw(fig, render.level_of_detail(protein, detail), text['axes'], text['accuracy'])
+        if show is True:
+            plt.show()
+        return protein
+
+    else:
+        raise ValueError(text['fetch_structure'].format(status))
+
+def cut_dna(dna, cut_pos, text):
+    if isinstance(cut_pos, CutSite):
+        cut_pos = cut_pos.cut
+    if cut_pos<0 or cut_pos>=len(dna):
+        raise ValueError(text['cut_position'])
+    # an EditableSequence remembers the cut instead of copying the sequence around a '|' marker
+    if isinstance(dna, EditableSequence):
+        return dna.cut(cut_pos)
+    return dna[:cut_pos] + '|' + dna[cut_pos:]
+
+def repair_dna(dna, repair_type, cut_pos, repair_sequence, text):
+    if isinstance(cut_pos, CutSite):
+        cut_pos = cut_pos.cut
+    if isinstance(dna, EditableSequence):
+        if cut_pos is None:
+            cut_pos = dna.cut_position
+        if cut_pos is None or not (repair_type == 'NHEJ' or (repair_type == 'HDR' and repair_sequence)):
+            raise ValueError(text['repair'])
+        return dna.repair(repair_type, cut_pos, repair_sequence)
+
+    if '|' in dna:
+        cut_pos = dna.index('|')  # Set cut position from the cut marker '|'
+        dna = dna.replace('|', '')  # Remove the cut marker from the DNA sequence
+
+    # Check if repair_type and repair_sequence are valid
+    if repair_type == 'NHEJ':
+        # Simulate deletion: remove one base from the cut position
+        return dna[:cut_pos] + dna[cut_pos+1:]
+
+    elif repair_type == 'HDR' and repair_sequence:
+        # Simulate insertion: insert the repair sequence at the cut position
+        return dna[:cut_pos] + repair_sequence + dna[cut_pos:]
+
+    else:
+        raise ValueError(text['repair'])
+
+def find(string, sequence, text):
+    # the pattern is short and decoded whole; a PackedSequence string is searched block by block below
+    if isinstance(sequence, PackedSequence):
+        sequence = str(sequence)
+
+    # a prebuilt SequenceIndex answers the query without rescanning the reference
+    if isinstance(string, SequenceIndex):
+        occurrences = string.find(sequence)
+        if not occurrences:
+            raise ValueError(text['not_found'])
+        return occurrences
+
+    # Check both are strings
+    if not isinstance(string, (str, PackedSequence)) or not isinstance(sequence, str):
+        raise TypeError(text['not_str'])
+
+    # Check string is longer than sequence
+    if len(string) < len(sequence):
+        raise ValueError(text['longer'])
+
+    if isinstance(string, PackedSequence):
+        occurrences = _find_blocks(string, sequence)
+        if not occurrences:
+            raise ValueError(text['not_found'])
+        return occurrences
+
+    # Check if the sequence exists in the string
+    if sequence not in string:
+        raise ValueError(text['not_found'])
+
+    # Find all occurrences of the sequence
+    occurrences = []
+    start_index = 0
+    while start_index < len(string):
+        start_index = string.find(sequence, start_index)
+        if start_index == -1:  # No more occurrences
+            break
+        end_index = start_index + len(sequence) - 1
+        occurrences.append((start_index, end_index))
+        start_index += 1  # Move to the next possible starting position
+
+    return occurrences
+
+def _find_blocks(string, sequence):
+    """Occurrences of sequence in a PackedSequence, decoding one block (and the bases a match can overrun) at a time"""
+    occurrences = []
+    for start, block in string.blocks(overlap=max(len(sequence) - 1, 0)):
+        block = block.decode('ascii')
+        index = block.find(sequence)
+        while index != -1 and index < BLOCK and start + index < len(string):
+            occurrences.append((start + index, start + index + len(sequence) - 1))
+            index = block.find(sequence, index + 1)
+    return occurrences
+
+def check_codon(string, text, mode='strict'):
+    if len(string) == 0:
+        raise ValueError(text['empty'])
+
+    # Check if string length is divisible by 3
+    if len(string) % 3 != 0:
+        if len(string) < 3:
+            raise ValueError(text['codons_short'].format(str(string)))
+        if len(string) % 2 == 0:
+            resting = string[-1]
+        else:
+            resting = str(string[-2:])
+        raise ValueError(text['codons_rest'].format(resting))
+
+    # the alphabet is classified once and all codons are checked in one pass
+    return [codon for _, codon in validate.find_invalid_codons(string, mode)]
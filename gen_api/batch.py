@@ -0,0 +1,66 @@
+"""Chunked execution engine behind iterate"""
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import pipeline
+
+DEFAULT_CHUNK_SIZE = 10000
+
+_EXECUTORS = {'process': ProcessPoolExecutor, 'thread': ThreadPoolExecutor}
+
+def _chunks(strings, chunk_size):
+    strings = iter(strings)
+    while True:
+        chunk = list(itertools.islice(strings, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def run_chunk(module, functions, chunk):
+    """Applies every function to a chunk of strings through a pipeline.Plan, one column per function"""
+    return pipeline.Plan(functions, module).run(chunk)
+
+def run_chunks(strings, functions, module, workers=1, executor='process', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields (chunk, columns) for consecutive chunks of strings, in input order.
+
+    With workers=1 the chunks run in this process; otherwise they are spread
+    over a process or thread pool of that many workers (None for one per CPU).
+    Only a few chunks per worker are in flight at a time, so the input can be
+    a generator that is far larger than memory.
+    """
+    if executor not in _EXECUTORS:
+        raise ValueError("executor must be 'process' or 'thread'")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be a positive integer or None")
+    functions = list(functions)
+
+    if workers == 1:
+        for chunk in _chunks(strings, chunk_size):
+            yield chunk, run_chunk(module, functions, chunk)
+        return
+
+    with _EXECUTORS[executor](max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunks(strings, chunk_size):
+            pending.append((chunk, pool.submit(run_chunk, module, functions, chunk)))
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+def run(strings, functions, module, workers=1, executor='process', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Returns the input column followed by one column (list) per function, see run_chunks"""
+    columns = [[] for _ in range(len(functions) + 1)]
+    for chunk, results in run_chunks(strings, functions, module, workers, executor, chunk_size):
+        columns[0].extend(chunk)
+        for column, result in zip(columns[1:], results):
+            column.extend(result)
+    return columns
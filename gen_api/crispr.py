@@ -0,0 +1,101 @@
+"""Cas9 cut site scanner: PAM matches with IUPAC codes on both strands in one pass"""
+from collections import namedtuple
+
+import numpy as np
+
+from . import _core
+from .packed import PackedSequence
+
+CutSite = namedtuple('CutSite', ['cut', 'strand', 'pam_start', 'protospacer', 'pam'])
+
+DEFAULT_BLOCK = 1 << 20
+
+# one bit per base, so that an IUPAC code is the OR of the bases it stands for
+_A, _C, _G, _T = 1, 2, 4, 8
+_IUPAC = {'A': _A, 'C': _C, 'G': _G, 'T': _T, 'U': _T,
+          'R': _A | _G, 'Y': _C | _T, 'S': _C | _G, 'W': _A | _T, 'K': _G | _T, 'M': _A | _C,
+          'B': _C | _G | _T, 'D': _A | _G | _T, 'H': _A | _C | _T, 'V': _A | _C | _G, 'N': _A | _C | _G | _T}
+_COMPLEMENT_BITS = {_A: _T, _C: _G, _G: _C, _T: _A}
+
+_BASE_BITS = np.zeros(256, dtype=np.uint8)  # N and other characters of the sequence match nothing
+for _base in 'ACGTU':
+    _BASE_BITS[ord(_base)] = _BASE_BITS[ord(_base.lower())] = _IUPAC[_base]
+
+_COMPLEMENT = bytes.maketrans(b'ACGTUNacgtun', b'TGCAANtgcaan')
+
+def _complement_mask(mask):
+    return sum(complement for bit, complement in _COMPLEMENT_BITS.items() if mask & bit)
+
+def _reverse_complement(raw):
+    return raw.translate(_COMPLEMENT)[::-1].decode('ascii')
+
+def _matches(bits, masks):
+    """Start indexes where every base of bits is one of the bases allowed by masks"""
+    starts = len(bits) - len(masks) + 1
+    if starts <= 0:
+        return np.empty(0, dtype=np.intp)
+    hit = np.ones(starts, dtype=bool)
+    for i, mask in enumerate(masks):
+        hit &= (bits[i:i+starts] & mask) != 0
+    return np.flatnonzero(hit)
+
+def _blocks(seq, block_size):
+    if isinstance(seq, PackedSequence):
+        for _, block in seq.blocks(block_size):
+            yield block
+        return
+    if isinstance(seq, (str, bytes, bytearray, memoryview)):
+        raw = _core.as_bytes(seq, 'Could not read provided DNA string')
+        for start in range(0, len(raw), block_size):
+            yield raw[start:start + block_size]
+        return
+    for chunk in seq:
+        yield _core.as_bytes(chunk, 'Could not read provided DNA string')
+
+def scan_cut_sites(seq, pam='NGG', spacer_len=20, block_size=DEFAULT_BLOCK):
+    """Yields a CutSite for every PAM match with room for a protospacer, on both strands.
+
+    seq is a DNA string (or PackedSequence), or an iterable of consecutive
+    chunks of one, which is scanned block by block so memory stays flat. pam
+    may use IUPAC codes (N, R, Y...). On the '+' strand the protospacer is the
+    spacer_len bases before the PAM; on the '-' strand the PAM is read on the
+    reverse complement, so the protospacer and pam fields are reverse
+    complemented. cut is the blunt Cas9 cut 3 bases from the PAM, as a
+    position ready for cut_dna, and pam_start the first PAM base on seq.
+    Sites come in the order of their leftmost base.
+    """
+    if not pam or any(code not in _IUPAC for code in pam.upper()):
+        raise ValueError('PAM must be made of IUPAC nucleotide codes')
+    if spacer_len < 4:
+        raise ValueError('spacer_len must be an integer of at least 4')
+    masks = [_IUPAC[code] for code in pam.upper()]
+    reverse_masks = [_complement_mask(mask) for mask in reversed(masks)]
+    pam_length = len(pam)
+    site = spacer_len + pam_length
+
+    carry, offset = b'', 0  # offset: position in seq of window[0]
+    for chunk in _blocks(seq, block_size):
+        window = carry + chunk
+        bits = _BASE_BITS[np.frombuffer(window, dtype=np.uint8)]
+
+        # sites ending in the carried bases were already reported with the previous window
+        first = max(len(carry) - site + 1, 0)
+        forward = _matches(bits[spacer_len:], masks)
+        reverse = _matches(bits[:len(bits) - spacer_len], reverse_masks)
+        forward, reverse = forward[forward >= first], reverse[reverse >= first]
+        starts = np.concatenate([forward, reverse])
+        order = np.argsort(starts, kind='stable')
+        reverse_strand = (order >= len(forward)).tolist()
+        for start, is_reverse in zip(starts[order].tolist(), reverse_strand):
+            if is_reverse:
+                yield CutSite(offset + start + pam_length + 3, '-', offset + start,
+                              _reverse_complement(window[start + pam_length:start + site]),
+                              _reverse_complement(window[start:start + pam_length]))
+            else:
+                pam_start = start + spacer_len
+                yield CutSite(offset + pam_start - 3, '+', offset + pam_start,
+                              window[start:pam_start].decode('ascii'),
+                              window[pam_start:start + site].decode('ascii'))
+
+        carry = window[len(window) - site + 1:] if len(window) >= site else window
+        offset += len(window) - len(carry)
@@ -0,0 +1,183 @@
+"""Editable sequence backed by a piece table, for many CRISPR edits on long sequences"""
+import random
+
+from . import _core
+from .packed import PackedSequence
+
+_ORIGINAL, _ADDED = 0, 1
+# priorities come from a private generator, so edits don't advance the global one seeded by random.seed
+_priorities = random.Random()
+
+class _Piece:
+    """Node of an implicit treap: a run of bases from one of the two buffers.
+
+    In-order traversal gives the pieces in sequence order; size is the number
+    of bases in the subtree, so positions are found without stored offsets.
+    """
+    __slots__ = ('source', 'start', 'length', 'size', 'priority', 'left', 'right')
+
+    def __init__(self, source, start, length, priority=None):
+        self.source = source
+        self.start = start
+        self.length = length
+        self.size = length
+        self.priority = _priorities.random() if priority is None else priority
+        self.left = None
+        self.right = None
+
+def _size(node):
+    return node.size if node is not None else 0
+
+def _update(node):
+    node.size = _size(node.left) + node.length + _size(node.right)
+
+def _split(node, pos):
+    """Splits the tree into its first pos bases and the rest, cutting a piece in two if needed"""
+    if node is None:
+        return None, None
+    left_size = _size(node.left)
+    if pos <= left_size:
+        first, rest = _split(node.left, pos)
+        node.left = rest
+        _update(node)
+        return first, node
+    if pos >= left_size + node.length:
+        first, rest = _split(node.right, pos - left_size - node.length)
+        node.right = first
+        _update(node)
+        return node, rest
+    offset = pos - left_size
+    tail = _Piece(node.source, node.start + offset, node.length - offset, node.priority)
+    tail.right = node.right
+    _update(tail)
+    node.length = offset
+    node.right = None
+    _update(node)
+    return node, tail
+
+def _merge(first, rest):
+    if first is None:
+        return rest
+    if rest is None:
+        return first
+    if first.priority > rest.priority:
+        first.right = _merge(first.right, rest)
+        _update(first)
+        return first
+    rest.left = _merge(first, rest.left)
+    _update(rest)
+    return rest
+
+class EditableSequence:
+    """Sequence for many edits (cuts, substitutions, deletions, insertions) without copying it on every edit.
+
+    The bases live in two buffers, the original sequence and an append-only
+    buffer of inserted bases, and the sequence is a piece table over them kept
+    in a balanced tree, so each edit costs O(log n) in the number of pieces.
+    str() or to_bytes() builds the edited sequence once, at the end.
+    """
+
+    def __init__(self, seq):
+        if isinstance(seq, PackedSequence):
+            original = seq.to_array().tobytes()  # the piece table reads its bases from one bytes buffer
+        else:
+            original = _core.as_bytes(seq, 'Could not read provided sequence')
+        # every byte of the buffers belongs to at most one piece, so replace can overwrite it in place
+        self._buffers = (bytearray(original), bytearray())
+        self._root = _Piece(_ORIGINAL, 0, len(original)) if original else None
+        self.cut_position = None
+
+    def __len__(self):
+        return _size(self._root)
+
+    def _pieces(self):
+        stack, node = [], self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    def to_bytes(self):
+        return b''.join(self._buffers[piece.source][piece.start:piece.start + piece.length] for piece in self._pieces())
+
+    def __str__(self):
+        return self.to_bytes().decode('ascii')
+
+    def __repr__(self):
+        return f'EditableSequence(length={len(self)}, pieces={sum(1 for _ in self._pieces())})'
+
+    def _locate(self, pos):
+        """Buffer and index in it of the base at position pos"""
+        if not 0 <= pos < len(self):
+            raise IndexError('EditableSequence position out of range')
+        node = self._root
+        while True:
+            left_size = _size(node.left)
+            if pos < left_size:
+                node = node.left
+            elif pos < left_size + node.length:
+                return self._buffers[node.source], node.start + pos - left_size
+            else:
+                pos -= left_size + node.length
+                node = node.right
+
+    def __getitem__(self, pos):
+        if pos < 0:
+            pos += len(self)
+        buffer, index = self._locate(pos)
+        return chr(buffer[index])
+
+    def replace(self, pos, base):
+        """Overwrites the base at position pos in place, without adding a piece"""
+        new = _core.as_bytes(base, 'Could not read provided sequence')
+        if len(new) != 1:
+            raise ValueError('replace takes a single base')
+        buffer, index = self._locate(pos)
+        buffer[index] = new[0]
+        return self
+
+    def insert(self, pos, seq):
+        """Inserts seq before position pos (pos == len(self) appends)"""
+        if not 0 <= pos <= len(self):
+            raise IndexError('EditableSequence position out of range')
+        added = _core.as_bytes(seq, 'Could not read provided sequence')
+        if not added:
+            return self
+        buffer = self._buffers[_ADDED]
+        piece = _Piece(_ADDED, len(buffer), len(added))
+        buffer += added
+        first, rest = _split(self._root, pos)
+        self._root = _merge(_merge(first, piece), rest)
+        return self
+
+    def delete(self, pos, length=1):
+        """Deletes length bases starting at position pos"""
+        if not 0 <= pos <= len(self) or length < 0:
+            raise IndexError('EditableSequence position out of range')
+        first, rest = _split(self._root, pos)
+        _, rest = _split(rest, length)
+        self._root = _merge(first, rest)
+        return self
+
+    def cut(self, pos):
+        """Marks a cut before position pos, as cut_dna does with '|'"""
+        if pos < 0 or pos >= len(self):
+            raise ValueError('Cut position is out of bounds.')
+        self.cut_position = pos
+        return self
+
+    def repair(self, repair_type, cut_pos=None, repair_sequence=None):
+        """Repairs the cut like repair_dna: 'NHEJ' deletes the base at the cut, 'HDR' inserts repair_sequence there"""
+        if cut_pos is None:
+            cut_pos = self.cut_position
+        if cut_pos is None or not (repair_type == 'NHEJ' or (repair_type == 'HDR' and repair_sequence)):
+            raise ValueError('Invalid repair type or missing repair sequence for HDR.')
+        if repair_type == 'NHEJ':
+            self.delete(cut_pos)
+        else:
+            self.insert(cut_pos, repair_sequence)
+        self.cut_position = None
+        return self
@@ -0,0 +1,261 @@
+"""Pooled and cached HTTP access to the AlphaFold database (prediction JSON and PDB files)"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+API_URL = 'https://alphafold.ebi.ac.uk/api/prediction/{}'
+DEFAULT_CACHE_DIR = os.environ.get('GEN_API_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'gen_api', 'alphafold'))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+PredictionResult = namedtuple('PredictionResult', ['uniprot_id', 'prediction', 'error'])
+
+class RateLimiter:
+    """Spaces the calls to wait() at least 1/rate seconds apart, across all threads"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+class AlphaFoldClient:
+    """HTTP client for AlphaFold with a connection pool and an on-disk cache.
+
+    Responses are stored under the SHA-256 of their URL (the prediction URL
+    contains the UniProt ID). An entry younger than ttl seconds is served
+    without touching the network; an older one is revalidated with its ETag /
+    Last-Modified, so an unchanged file costs a 304 instead of a download.
+    When the cache grows beyond max_size bytes the least recently used
+    entries are deleted. cache_dir=None disables the cache.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=7 * 24 * 3600, max_size=1 << 30, api_url=API_URL,
+                 timeout=30, pool_size=16):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size = max_size
+        self.api_url = api_url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._session = None
+        self._size = None  # bytes in the cache, scanned on first store
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """requests.Session shared by every call, keeping connections to the server open"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + '.body', base + '.json'
+
+    def _load(self, url):
+        if self.cache_dir is None:
+            return None, None
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        os.utime(body_path)  # the body's mtime is its last access, used for LRU eviction
+        return body, meta
+
+    def _write(self, path, data):
+        # write to a temporary file first, so readers in other threads or processes never see half a file
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+
+    def _store(self, url, body, meta):
+        if self.cache_dir is None:
+            return
+        body_path, meta_path = self._paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        try:
+            previous = os.path.getsize(body_path)
+        except OSError:
+            previous = 0
+        self._write(body_path, body)
+        self._write(meta_path, json.dumps(meta).encode('utf-8'))
+        with self._lock:
+            if self._size is None:
+                self._size = self.cache_size()
+            else:
+                self._size += len(body) - previous
+            if self._size > self.max_size:
+                self._evict()
+
+    def _entries(self):
+        """(last access, size, body path) of every cached response"""
+        entries = []
+        for folder in os.scandir(self.cache_dir):
+            if folder.is_dir():
+                for entry in os.scandir(folder.path):
+                    if entry.name.endswith('.body'):
+                        try:
+                            stat = entry.stat()
+                        except OSError:  # removed meanwhile by another process
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _remove(self, body_path):
+        for path in (body_path, body_path[:-len('.body')] + '.json'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def cache_size(self):
+        """Bytes of cached responses on disk"""
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return 0
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        for _, size, path in sorted(self._entries()):
+            if self._size <= self.max_size:
+                break
+            self._remove(path)
+            self._size -= size
+
+    def get(self, url, limiter=None):
+        """Returns (status_code, content) for url; answers from the cache report 200, error statuses have content None.
+
+        limiter (a RateLimiter) is only waited on when the request actually goes to the network.
+        """
+        body, meta = self._load(url)
+        now = time.time()
+        if body is not None and now - meta['fetched'] < self.ttl:
+            return 200, body
+
+        headers = {}
+        if body is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        if limiter is not None:
+            limiter.wait()
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and body is not None:
+            meta['fetched'] = now
+            self._write(self._paths(url)[1], json.dumps(meta).encode('utf-8'))
+            return 200, body
+        if response.status_code == 200:
+            meta = {'url': url, 'fetched': now, 'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')}
+            self._store(url, response.content, meta)
+            return 200, response.content
+        return response.status_code, None
+
+    def prediction(self, uniprot_id, limiter=None):
+        """Returns (status_code, first prediction entry as a dict or None) for a UniProt ID"""
+        status, body = self.get(self.api_url.format(uniprot_id), limiter)
+        if status != 200:
+            return status, None
+        return status, json.loads(body)[0]
+
+    def clear(self):
+        """Deletes every cached response"""
+        if self.cache_dir is None or not os.path.isdir(self.cache_dir):
+            return
+        with self._lock:
+            for _, _, path in self._entries():
+                self._remove(path)
+            self._size = 0
+
+_client = None
+
+def default_client():
+    """The AlphaFoldClient used by alphafold_prediction and generate_protein"""
+    global _client
+    if _client is None:
+        _client = AlphaFoldClient()
+    return _client
+
+def configure(**options):
+    """Replaces the default client, e.g. configure(cache_dir=..., ttl=3600, api_url=...)"""
+    global _client
+    _client = AlphaFoldClient(**options)
+    return _client
+
+def _fetch_one(client, uniprot_id, limiter, retries, backoff):
+    import requests
+
+    for attempt in range(retries + 1):
+        try:
+            status, prediction = client.prediction(uniprot_id, limiter)
+        except requests.RequestException as error:  # connection errors and timeouts are retried like a 503
+            status, message = None, str(error)
+        except (ValueError, IndexError, KeyError, TypeError):  # e.g. a JSON object instead of a list
+            return PredictionResult(uniprot_id, None, 'Invalid response from the server')
+        except OSError as error:  # after RequestException, which is an OSError too: the cache could not be written
+            return PredictionResult(uniprot_id, None, f'Could not write the cache: {error}')
+        else:
+            if status == 200:
+                return PredictionResult(uniprot_id, prediction, None)
+            message = f'Failed to fetch data: {status}'
+        if status is not None and status not in RETRY_STATUSES:
+            break
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+    return PredictionResult(uniprot_id, None, message)
+
+def fetch_predictions(ids, concurrency=8, rate_limit=10, retries=4, backoff=0.5, client=None):
+    """Fetches the AlphaFold predictions of many UniProt IDs concurrently.
+
+    Yields a PredictionResult(uniprot_id, prediction, error) for every ID as
+    soon as it completes, so results arrive in completion order, not input
+    order. A failed ID has prediction None and the reason in error; it never
+    stops the batch. At most rate_limit requests per second reach the server
+    (None for no limit; cached answers don't count), and 429/5xx responses or
+    connection errors are retried up to retries times, waiting backoff,
+    2*backoff, 4*backoff... seconds in between. ids can be any iterable, it is
+    consumed as the work progresses.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be a positive integer")
+    client = client or default_client()
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending = set()
+        for uniprot_id in ids:
+            pending.add(pool.submit(_fetch_one, client, uniprot_id, limiter, retries, backoff))
+            if len(pending) >= 2 * concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
@@ -0,0 +1,167 @@
+import json
+import mmap
+import os
+
+import numpy as np
+
+from . import _core
+from .packed import PackedSequence
+
+SENTINEL = 0  # byte appended to the reference, smaller than any base
+
+def suffix_array(text):
+    """Suffix array of a bytes object by prefix doubling, with every round vectorised in NumPy"""
+    n = len(text)
+    symbols = np.frombuffer(text, dtype=np.uint8)
+    alphabet, ranks = np.unique(symbols, return_inverse=True)
+    ranks = ranks.astype(np.int64) + 1  # 0 is reserved for "past the end"
+
+    # first round: sort on the first k characters at once, packed into one 64-bit key
+    bits = int(len(alphabet)).bit_length()
+    k = max(1, 63 // bits)
+    keys = np.zeros(n, dtype=np.int64)
+    for offset in range(k):
+        shifted = np.zeros(n, dtype=np.int64)
+        shifted[:max(n - offset, 0)] = ranks[offset:]
+        keys = (keys << bits) | shifted
+    order = np.argsort(keys, kind='stable')
+    span = k
+
+    while True:
+        sorted_keys = keys[order]
+        group_starts = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+        ranks = np.empty(n, dtype=np.int64)
+        ranks[order] = np.cumsum(group_starts)
+        if ranks.max() == n or span >= n:
+            return order
+        # next round: rank of the first span characters, then of the following span characters
+        following = np.zeros(n, dtype=np.int64)
+        following[:n - span] = ranks[span:]
+        keys = ranks * (n + 1) + following
+        order = np.argsort(keys, kind='stable')
+        span *= 2
+
+class SequenceIndex:
+    """FM-index of a reference sequence for repeated exact-match queries.
+
+    count and locate run in time proportional to the pattern length (plus the
+    sample_rate steps needed to recover each position), instead of rescanning
+    the reference. The index is saved as a directory of flat files and loaded
+    back with mmap, so workers sharing a machine also share its pages.
+    """
+
+    def __init__(self, reference, block_size=64, sample_rate=32):
+        if isinstance(reference, PackedSequence):
+            reference = str(reference)
+        text = _core.as_bytes(reference, 'Could not read provided reference')
+        if b'\x00' in text:
+            raise ValueError('Could not read provided reference')
+        text += bytes([SENTINEL])
+
+        sa = suffix_array(text)
+        symbols = np.frombuffer(text, dtype=np.uint8)
+        bwt = symbols[sa - 1]  # sa - 1 == -1 wraps to the sentinel at the end
+        self._length = len(text) - 1
+        self._block_size = block_size
+        self._sample_rate = sample_rate
+        self._bwt = bwt.tobytes()
+        self._build_tables(bwt)
+
+        # positions divisible by sample_rate are stored, the others are found by walking LF
+        sampled = np.flatnonzero(sa % sample_rate == 0)
+        self._sampled_rows = sampled.astype(np.int64)
+        self._sampled_positions = sa[sampled].astype(np.int64)
+
+    def _build_tables(self, bwt):
+        counts = np.bincount(bwt, minlength=256)
+        self._alphabet = [int(symbol) for symbol in np.flatnonzero(counts)]
+        # C[c]: number of symbols smaller than c; occ[b][j]: occurrences of alphabet[j] before block b
+        self._first = dict(zip(self._alphabet, (np.cumsum(counts) - counts)[self._alphabet].tolist()))
+        blocks = -(-len(bwt) // self._block_size)
+        padded = np.full(blocks * self._block_size, 255, dtype=np.uint8)
+        padded[:len(bwt)] = bwt
+        per_block = np.stack([(padded == symbol).reshape(blocks, -1).sum(axis=1) for symbol in self._alphabet], axis=1)
+        self._occ = np.zeros((blocks + 1, len(self._alphabet)), dtype=np.int64)
+        np.cumsum(per_block, axis=0, out=self._occ[1:])
+        self._column = {symbol: j for j, symbol in enumerate(self._alphabet)}
+
+    def __len__(self):
+        return self._length
+
+    def _rank(self, symbol, row):
+        """Occurrences of symbol in bwt[:row]"""
+        block = row // self._block_size
+        start = block * self._block_size
+        return int(self._occ[block, self._column[symbol]]) + self._bwt[start:row].count(symbol)
+
+    def _range(self, pattern):
+        """Rows of the suffix array that start with pattern, by backward search"""
+        if isinstance(pattern, PackedSequence):
+            pattern = str(pattern)
+        pattern = _core.as_bytes(pattern, 'Could not read provided sequence')
+        low, high = 0, self._length + 1
+        for symbol in reversed(pattern):
+            if symbol not in self._column:
+                return 0, 0
+            low = self._first[symbol] + self._rank(symbol, low)
+            high = self._first[symbol] + self._rank(symbol, high)
+            if low >= high:
+                return 0, 0
+        return low, high
+
+    def count(self, pattern):
+        """Number of occurrences of pattern in the reference"""
+        low, high = self._range(pattern)
+        return high - low
+
+    def locate(self, pattern):
+        """Sorted start positions of every occurrence of pattern in the reference"""
+        low, high = self._range(pattern)
+        positions = []
+        for row in range(low, high):
+            steps = 0
+            while True:
+                i = np.searchsorted(self._sampled_rows, row)
+                if i < len(self._sampled_rows) and self._sampled_rows[i] == row:
+                    positions.append(int(self._sampled_positions[i]) + steps)
+                    break
+                symbol = self._bwt[row]
+                row = self._first[symbol] + self._rank(symbol, row)
+                steps += 1
+        return sorted(positions)
+
+    def find(self, pattern):
+        """Same output as find(reference, pattern): [(start_index, end_index), ...], [] when absent"""
+        return [(start, start + len(pattern) - 1) for start in self.locate(pattern)]
+
+    def save(self, path):
+        """Writes the index to the directory path"""
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'bwt.bin'), 'wb') as f:
+            f.write(self._bwt)
+        np.save(os.path.join(path, 'occ.npy'), self._occ)
+        np.save(os.path.join(path, 'sampled_rows.npy'), self._sampled_rows)
+        np.save(os.path.join(path, 'sampled_positions.npy'), self._sampled_positions)
+        meta = {'length': self._length, 'block_size': self._block_size, 'sample_rate': self._sample_rate,
+                'alphabet': self._alphabet, 'first': [self._first[symbol] for symbol in self._alphabet]}
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path):
+        """Opens an index written by save; the arrays are memory-mapped, not read into memory"""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        index = cls.__new__(cls)
+        index._length = meta['length']
+        index._block_size = meta['block_size']
+        index._sample_rate = meta['sample_rate']
+        index._alphabet = meta['alphabet']
+        index._first = dict(zip(meta['alphabet'], meta['first']))
+        index._column = {symbol: j for j, symbol in enumerate(meta['alphabet'])}
+        with open(os.path.join(path, 'bwt.bin'), 'rb') as f:
+            index._bwt = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        index._occ = np.load(os.path.join(path, 'occ.npy'), mmap_mode='r')
+        index._sampled_rows = np.load(os.path.join(path, 'sampled_rows.npy'), mmap_mode='r')
+        index._sampled_positions = np.load(os.path.join(path, 'sampled_positions.npy'), mmap_mode='r')
+        return index
@@ -0,0 +1,173 @@
+"""Vectorised random mutations, with the nominal weights of createmutation"""
+from collections import namedtuple
+
+import numpy as np
+
+from . import _core
+from .editable import EditableSequence
+
+# mutation types, numbered as in createmutation
+SUBSTITUTION, DELETION, INSERTION = 1, 5, 6
+_KINDS = np.array([SUBSTITUTION, DELETION, INSERTION], dtype=np.uint8)
+_KIND_WEIGHTS = np.array([75, 15, 10]) / 100  # weighted probabilties for biological reality
+_LENGTH_WEIGHTS = np.array([70, 20, 10]) / 100  # 1-3 bases, for deletions and insertions
+_BASES = np.frombuffer(b'ATCG', dtype=np.uint8)
+
+def _substitution_table():
+    """Candidate new bases per original byte, with their cumulative probabilities.
+
+    createmutation draws from the class of the original base (weight 2 each)
+    or the other class (weight 1 each) and retries while the base is unchanged,
+    so A, G, C and T go to their transition partner half the time; any other
+    character is replaced by C or T with 1/3 and A or G with 1/6.
+    """
+    candidates = np.empty((256, 4), dtype=np.uint8)
+    cumulative = np.empty((256, 4))
+    candidates[:] = np.frombuffer(b'CTAG', dtype=np.uint8)
+    cumulative[:] = np.cumsum([2, 2, 1, 1]) / 6
+    for base, transition, transversions in ((b'A', b'G', b'CT'), (b'G', b'A', b'CT'),
+                                            (b'C', b'T', b'AG'), (b'T', b'C', b'AG')):
+        candidates[base[0]] = np.frombuffer(transition + transversions + transition, dtype=np.uint8)
+        cumulative[base[0]] = [0.5, 0.75, 1.0, 1.0]
+    return candidates, cumulative
+
+_CANDIDATES, _CUMULATIVE = _substitution_table()
+
+class Mutations:
+    """n single mutations of one sequence, stored as arrays instead of n mutated strings.
+
+    Mutant i replaces (SUBSTITUTION), deletes (DELETION) or inserts before
+    (INSERTION) lengths[i] bases at positions[i]; bases[i, :lengths[i]] are
+    the new bases. Indexing or iterating builds the mutant strings on demand.
+    """
+
+    def __init__(self, seq, kinds, positions, lengths, bases):
+        self.seq = seq
+        self.kinds = kinds
+        self.positions = positions
+        self.lengths = lengths
+        self.bases = bases
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Mutations index out of range')
+        position, length = int(self.positions[index]), int(self.lengths[index])
+        new = self.bases[index, :length].tobytes()
+        if self.kinds[index] == DELETION:
+            mutant = self.seq[:position] + self.seq[position + length:]
+        elif self.kinds[index] == INSERTION:
+            mutant = self.seq[:position] + new + self.seq[position:]
+        else:
+            mutant = self.seq[:position] + new + self.seq[position + length:]
+        return mutant.decode('ascii')
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+def create_mutations(seq, n, seed=None):
+    """Draws n independent single mutations of seq at once and returns them as Mutations.
+
+    Types are drawn with the nominal weights of createmutation (75%
+    substitution, 15% deletion, 10% insertion). createmutation redraws the type
+    when a substitution leaves the base unchanged, so its actual mix is about
+    67/20/13; here a substitution always picks a different base and the 75/15/10
+    mix is kept. Positions, lengths (1-3 bases, 70/20/10) and bases follow
+    createmutation, including its 2:1 bias towards transitions; every mutant
+    differs from seq. seed is passed to numpy.random.default_rng, so the same
+    seed gives the same mutants.
+    """
+    raw = _core.as_bytes(seq, 'Could not read provided sequence')
+    if len(raw) == 0:
+        raise ValueError('The provided string is empty, check your input.')
+    if n < 0:
+        raise ValueError('n must be a non-negative integer')
+    codes = np.frombuffer(raw, dtype=np.uint8)
+    return Mutations(raw, *_draw(np.random.default_rng(seed), len(codes), n, codes.__getitem__))
+
+def _draw(rng, length, n, original_bases):
+    """kinds, positions, lengths and bases of n mutations of a sequence of the given length.
+
+    original_bases(positions) returns the bytes of the sequence at those
+    positions as a uint8 array; it is only asked for the substituted ones.
+    """
+    kinds = _KINDS[rng.choice(3, size=n, p=_KIND_WEIGHTS)]
+    positions = rng.integers(0, length, size=n)
+    lengths = rng.choice(np.arange(1, 4, dtype=np.uint8), size=n, p=_LENGTH_WEIGHTS)
+    bases = _BASES[rng.integers(0, 4, size=(n, 3))]
+
+    substitutions = np.flatnonzero(kinds == SUBSTITUTION)
+    original = original_bases(positions[substitutions])
+    draws = rng.random(len(substitutions))
+    choice = (draws[:, None] >= _CUMULATIVE[original]).sum(axis=1)
+    bases[substitutions, 0] = _CANDIDATES[original, choice]
+    lengths[substitutions] = 1
+
+    deletions = kinds == DELETION
+    lengths[deletions] = np.minimum(lengths[deletions], length - positions[deletions])  # avoid index out of range
+    return kinds, positions, lengths, bases
+
+Generation = namedtuple('Generation', ['generation', 'length', 'gc', 'substitutions', 'deletions', 'insertions', 'sequence'])
+
+def _gc(bases):
+    return bases.count(b'G') + bases.count(b'C')
+
+def evolve(seq, generations, rate, every=1, seed=None, snapshots=False):
+    """Simulates generations of random mutation of seq and yields a Generation every `every` generations.
+
+    Each generation every base mutates with probability rate, with the types,
+    lengths and bases of create_mutations. The sequence is an EditableSequence:
+    substitutions overwrite their base in place and indels are edits of its
+    piece table, and the GC count is kept up to date by every mutation, so a
+    generation costs time in proportion to its mutations, not to the length.
+    A Generation holds the generation number, the length, the GC fraction and
+    the cumulative counts of each mutation type; sequence is a str snapshot
+    when snapshots is True, and always for the last generation, and is the
+    only step that copies the whole sequence.
+    """
+    sequence = EditableSequence(seq)
+    if generations < 0 or every < 1:
+        raise ValueError('generations must be non-negative and every a positive integer')
+    if not 0 <= rate <= 1:
+        raise ValueError('rate must be a probability between 0 and 1')
+    rng = np.random.default_rng(seed)
+    counts = dict.fromkeys(_KINDS.tolist(), 0)
+    gc = _gc(sequence.to_bytes())
+
+    def original_bases(positions):
+        return np.array([ord(sequence[position]) for position in positions.tolist()], dtype=np.uint8)
+
+    for generation in range(1, generations + 1):
+        n = rng.poisson(rate * len(sequence)) if len(sequence) else 0
+        if n:
+            kinds, positions, lengths, bases = _draw(rng, len(sequence), n, original_bases)
+            for i in np.flatnonzero(kinds == SUBSTITUTION).tolist():
+                position, new = int(positions[i]), bases[i, :1].tobytes()
+                gc += _gc(new) - _gc(sequence[position].encode('ascii'))
+                sequence.replace(position, new)
+
+            # from the last position to the first, so that every indel lands where it was drawn
+            indels = np.flatnonzero(kinds != SUBSTITUTION)
+            for i in indels[np.argsort(positions[indels], kind='stable')[::-1]].tolist():
+                position, length = int(positions[i]), int(lengths[i])
+                if kinds[i] == DELETION:
+                    length = min(length, len(sequence) - position)
+                    gc -= sum(sequence[p] in 'GC' for p in range(position, position + length))
+                    sequence.delete(position, length)
+                else:
+                    new = bases[i, :length].tobytes()
+                    gc += _gc(new)
+                    sequence.insert(position, new)
+            for kind, count in zip(*np.unique(kinds, return_counts=True)):
+                counts[int(kind)] += int(count)
+
+        if generation % every == 0 or generation == generations:
+            length = len(sequence)
+            snapshot = str(sequence) if snapshots or generation == generations else None
+            yield Generation(generation, length, gc / length if length else 0.0,
+                             counts[SUBSTITUTION], counts[DELETION], counts[INSERTION], snapshot)
@@ -0,0 +1,155 @@
+from collections import namedtuple
+
+import numpy as np
+
+from . import _core
+from .packed import PackedSequence
+
+ORF = namedtuple('ORF', ['strand', 'frame', 'start', 'end', 'peptide'])
+
+def _sense_table(pairs):
+    table = np.full(256, _core.INVALID_BASE, dtype=np.uint8)
+    for base, sense in pairs.items():
+        table[ord(base)] = table[ord(base.lower())] = 'ACGU'.index(sense)
+    return table
+
+# base codes of the sense (mRNA) strand: DNA input is the template strand, as in dna2rna
+_SENSE_CODES = {'DNA': _sense_table({'A': 'U', 'T': 'A', 'C': 'G', 'G': 'C'}),
+                'RNA': _sense_table({'A': 'A', 'C': 'C', 'G': 'G', 'U': 'U'})}
+
+def _codon_mask(codons):
+    mask = np.zeros(64, dtype=bool)
+    for codon in codons:
+        mask[_core.CODONS.index(codon)] = True
+    return mask
+
+# same start/end codons as check: TAC -> AUG starts, ATT/ATC/ACC -> UAA/UAG/UGG end
+_IS_START = _codon_mask(['AUG'])
+_IS_STOP = _codon_mask(['UAA', 'UAG', 'UGG'])
+
+_FORWARD_START, _FORWARD_STOP, _REVERSE_START, _REVERSE_STOP, _BREAK = range(5)
+
+_CODON_AMINO = np.frombuffer(_core.CODON_AMINO, dtype=np.uint8)
+_AMINO_RECORDS = [' ' + name for name in _core.AMINO_NAMES]
+_STOP = bytes([_core.STOP])
+
+def _chunks(seq, chunk_size):
+    if isinstance(seq, (str, PackedSequence)):
+        for i in range(0, len(seq), chunk_size):
+            yield str(seq[i:i+chunk_size])
+    else:
+        yield from seq
+
+def _codons(codes):
+    """Codon codes of both strands at every position of a block of sense-strand base codes"""
+    first, second, third = codes[:-2], codes[1:-1], codes[2:]
+    invalid = (first == _core.INVALID_BASE) | (second == _core.INVALID_BASE) | (third == _core.INVALID_BASE)
+    forward = (first << 4 | second << 2 | third) & 63
+    reverse = ((3 - third) << 4 | (3 - second) << 2 | (3 - first)) & 63  # reverse complement read backwards
+    return forward, reverse, invalid
+
+def _codon_events(forward, reverse, invalid, offset):
+    """Positions and kinds of every start, stop or unreadable codon, in position order"""
+    positions, kinds = [], []
+    for kind, mask in ((_FORWARD_START, _IS_START[forward]), (_FORWARD_STOP, _IS_STOP[forward]),
+                       (_REVERSE_START, _IS_START[reverse]), (_REVERSE_STOP, _IS_STOP[reverse]),
+                       (_BREAK, invalid)):
+        if kind != _BREAK:
+            mask &= ~invalid
+        found = np.flatnonzero(mask)
+        positions.append(found + offset)
+        kinds.append(np.full(len(found), kind, dtype=np.uint8))
+    positions = np.concatenate(positions)
+    order = np.argsort(positions, kind='stable')
+    return positions[order].tolist(), np.concatenate(kinds)[order].tolist()
+
+def _peptide(aminos):
+    """Amino acid names from a bytes object of amino indexes; an internal UGA ends it, as in rna2amino"""
+    end = aminos.find(_STOP)
+    if end != -1:
+        aminos = aminos[:end]
+    return ''.join(map(_AMINO_RECORDS.__getitem__, aminos))
+
+def _reverse_orf(aminos, base, frame, stop, start, min_len):
+    if stop is None or start is None or (start - stop) // 3 < min_len:
+        return None
+    return ORF('-', frame, stop, start + 2, _peptide(aminos[start-base:stop-base:-3]))
+
+def iter_orfs(seq, min_len=0, kind=None, chunk_size=1 << 20):
+    """Yields the open reading frames of all six frames in a single streaming pass.
+
+    seq can be a string, a PackedSequence or any iterable of sequence pieces
+    (e.g. the lines of a FASTA record), so genome-sized inputs never need to be
+    held in memory at once. DNA input is read as the template strand, like
+    dna2rna does. Each ORF runs from the first AUG after a stop to the next
+    UAA/UAG/UGG in the same frame (the codons check accepts); start and end are
+    0-based inclusive positions in the input, with start < end on both strands,
+    and peptides are translated like rna2amino. min_len is the minimum number
+    of codons before the stop codon. Bases that are not A/C/G/T(U), such as N
+    runs, end the frames that run into them.
+    """
+    forward_open = [None] * 3    # first start codon since the last forward stop
+    reverse_stop = [None] * 3    # last reverse-strand stop codon
+    reverse_start = [None] * 3   # highest reverse-strand start codon after it
+    buffer = np.empty(0, dtype=np.uint8)
+    base = 0  # position in the input of buffer[0]
+
+    for chunk in _chunks(seq, chunk_size):
+        if not chunk:
+            continue
+        if kind is None:
+            kind = 'RNA' if ('U' in chunk or 'u' in chunk) and 'T' not in chunk else 'DNA'
+        raw = _core.as_bytes(chunk, 'Could not read provided sequence')
+        codes = _SENSE_CODES[kind][np.frombuffer(raw, dtype=np.uint8)]
+        scan_from = max(len(buffer) - 2, 0)  # codons before this were scanned with the previous chunk
+        buffer = np.concatenate([buffer, codes])
+        if len(buffer) < 3:
+            continue
+
+        forward, reverse, invalid = _codons(buffer)
+        forward_aminos = _CODON_AMINO[forward].tobytes()
+        reverse_aminos = _CODON_AMINO[reverse].tobytes()
+        events = _codon_events(forward[scan_from:], reverse[scan_from:], invalid[scan_from:], base + scan_from)
+        for position, event in zip(*events):
+            frame = position % 3
+            if event == _FORWARD_START:
+                if forward_open[frame] is None:
+                    forward_open[frame] = position
+            elif event == _FORWARD_STOP:
+                start = forward_open[frame]
+                forward_open[frame] = None
+                if start is not None and (position - start) // 3 >= min_len:
+                    yield ORF('+', frame, start, position + 2, _peptide(forward_aminos[start-base:position-base:3]))
+            elif event == _REVERSE_START:
+                if reverse_stop[frame] is not None:
+                    reverse_start[frame] = position
+            else:
+                # reverse-strand frames are read from high to low positions, so an ORF is only
+                # complete once the next stop (or unreadable base) above its start is reached
+                orf = _reverse_orf(reverse_aminos, base, frame, reverse_stop[frame], reverse_start[frame], min_len)
+                if orf:
+                    yield orf
+                reverse_stop[frame] = position if event == _REVERSE_STOP else None
+                reverse_start[frame] = None
+                if event == _BREAK:
+                    forward_open[frame] = None
+
+        # only bases that an open frame may still need (plus the last two for the next codon) are kept
+        keep_from = base + len(buffer) - 2
+        for position in forward_open + reverse_stop:
+            if position is not None:
+                keep_from = min(keep_from, position)
+        buffer = buffer[keep_from-base:].copy()
+        base = keep_from
+
+    # reading the reverse strand starts at the end of the input, like a stop codon would
+    if len(buffer) >= 3:
+        reverse_aminos = _CODON_AMINO[_codons(buffer)[1]].tobytes()
+        for frame in range(3):
+            orf = _reverse_orf(reverse_aminos, base, frame, reverse_stop[frame], reverse_start[frame], min_len)
+            if orf:
+                yield orf
+
+def find_orfs(seq, min_len=0):
+    """Returns the open reading frames of all six frames as a list of ORF(strand, frame, start, end, peptide), see iter_orfs"""
+    return sorted(iter_orfs(seq, min_len), key=lambda orf: (orf.start, orf.strand))
@@ -0,0 +1,165 @@
+import numpy as np
+
+from . import _core
+
+# 2-bit codes: A=0, C=1, G=2, T/U=3, so that the complement of a code is code ^ 0b11
+_ALPHABETS = {'DNA': b'ACGT', 'RNA': b'ACGU'}
+_EXCEPTION = 255
+BLOCK = 1 << 16  # bases decoded at a time by blocks()
+
+def _code_table(alphabet):
+    table = np.full(256, _EXCEPTION, dtype=np.uint8)
+    for code, base in enumerate(alphabet):
+        table[base] = code
+    return table
+
+_CODE_TABLES = {kind: _code_table(alphabet) for kind, alphabet in _ALPHABETS.items()}
+_LETTERS = {kind: np.frombuffer(alphabet, dtype=np.uint8) for kind, alphabet in _ALPHABETS.items()}
+
+def _pack(codes):
+    """Packs an array of 2-bit codes, four per byte (first base in the high bits)"""
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+class PackedSequence:
+    """DNA or RNA sequence stored with 2 bits per base.
+
+    Bases outside the alphabet (N, lowercase letters, ...) are kept in a small
+    side table of (position, character) pairs. Slices with step 1 are views
+    that share the packed buffer with the original sequence.
+    """
+
+    def __init__(self, seq, kind=None):
+        raw = _core.as_bytes(seq, 'Could not read provided sequence')
+        if kind is None:
+            kind = 'RNA' if (b'U' in raw or b'u' in raw) and b'T' not in raw else 'DNA'
+        if kind not in _ALPHABETS:
+            raise ValueError("Sequence kind must be 'DNA' or 'RNA'")
+
+        codes = _CODE_TABLES[kind][np.frombuffer(raw, dtype=np.uint8)]
+        exceptions = np.flatnonzero(codes == _EXCEPTION)
+        self._exception_values = np.frombuffer(raw, dtype=np.uint8)[exceptions].copy()
+        self._exception_positions = exceptions
+        codes[exceptions] = 0
+        self._data = _pack(codes)
+        self._start = 0
+        self._length = len(raw)
+        self.kind = kind
+
+    @classmethod
+    def _view(cls, data, start, length, kind, exception_positions, exception_values):
+        view = cls.__new__(cls)
+        view._data = data
+        view._start = start
+        view._length = length
+        view.kind = kind
+        view._exception_positions = exception_positions
+        view._exception_values = exception_values
+        return view
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return PackedSequence(str(self)[index], self.kind)
+            length = max(stop - start, 0)
+            return PackedSequence._view(self._data, self._start + start, length, self.kind,
+                                        self._exception_positions, self._exception_values)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('PackedSequence index out of range')
+        return chr(self.to_array(index, index + 1)[0])
+
+    def __str__(self):
+        return self.to_array().tobytes().decode('ascii')
+
+    def __repr__(self):
+        preview = str(self[:20]) + ('...' if self._length > 20 else '')
+        return f"PackedSequence('{preview}', kind='{self.kind}', length={self._length})"
+
+    def __eq__(self, other):
+        if isinstance(other, PackedSequence):
+            return self._length == other._length and np.array_equal(self.to_array(), other.to_array())
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    @property
+    def nbytes(self):
+        """Memory used by the packed buffer and the exception table"""
+        return self._data.nbytes + self._exception_positions.nbytes + self._exception_values.nbytes
+
+    def _exceptions(self, start=0, stop=None):
+        """Exception positions (relative to this view) and values within [start, stop)"""
+        stop = self._length if stop is None else stop
+        low, high = np.searchsorted(self._exception_positions, [self._start + start, self._start + stop])
+        return self._exception_positions[low:high] - self._start, self._exception_values[low:high]
+
+    def codes(self, start=0, stop=None):
+        """Returns the 2-bit codes (0-3) of the bases as a uint8 array; exceptions read as 0"""
+        stop = self._length if stop is None else stop
+        first = self._start + start
+        chunk = self._data[first // 4:(self._start + stop + 3) // 4]
+        unpacked = np.empty((len(chunk), 4), dtype=np.uint8)
+        for i, shift in enumerate((6, 4, 2, 0)):
+            unpacked[:, i] = (chunk >> shift) & 3
+        offset = first % 4
+        return unpacked.ravel()[offset:offset + stop - start]
+
+    def has_exceptions(self):
+        return len(self._exceptions()[0]) > 0
+
+    def to_array(self, start=0, stop=None):
+        """Returns the sequence as a uint8 array of ASCII letters"""
+        stop = self._length if stop is None else stop
+        letters = _LETTERS[self.kind][self.codes(start, stop)]
+        positions, values = self._exceptions(start, stop)
+        letters[positions - start] = values
+        return letters
+
+    def blocks(self, block_size=BLOCK, overlap=0):
+        """Yields (start, bytes) for consecutive blocks of block_size bases, as ASCII letters.
+
+        Each block also holds the first overlap bases of the next one, so a
+        match of up to overlap + 1 bases is whole in the block where it starts.
+        Only one block is decoded at a time.
+        """
+        for start in range(0, max(self._length - overlap, 1), block_size):
+            yield start, self.to_array(start, min(start + block_size + overlap, self._length)).tobytes()
+
+    def transcribe(self, table, error):
+        """Complementary transcription as a bit operation on the packed buffer (used by dna2rna/rna2dna).
+
+        table is one of the transcription tables of _core in any mode; the
+        IUPAC codes live in the exception table and are mapped through it.
+        """
+        # only the DNA to RNA tables accept a T
+        source, target = ('DNA', 'RNA') if table[ord('T')] else ('RNA', 'DNA')
+        if self.kind != source:
+            return PackedSequence(_core.transcribe(str(self), table, error), target)
+
+        first, last = self._start // 4, (self._start + self._length + 3) // 4
+        data = ~self._data[first:last]  # inverting a byte complements its four 2-bit codes
+        start = self._start % 4
+        positions, values = self._exceptions()
+        values = np.frombuffer(table, dtype=np.uint8)[values]
+        if not values.all():
+            raise ValueError(error.format(int(positions[np.argmin(values)])))
+
+        # exceptions that became regular bases (e.g. lowercase input) are written back into the buffer
+        codes = _CODE_TABLES[target][values]
+        regular = codes != _EXCEPTION
+        for position, code in zip(positions[regular] + start, codes[regular]):
+            shift = 6 - 2 * (position % 4)
+            data[position // 4] = (data[position // 4] & (0xFF ^ (3 << shift))) | (int(code) << shift)
+        return PackedSequence._view(data, start, self._length, target,
+                                    positions[~regular] + start, values[~regular])
@@ -0,0 +1,41 @@
+"""Execution plans for iterate: function names are resolved once and shared intermediates computed once per input"""
+import importlib
+import inspect
+from functools import lru_cache
+
+from . import _core
+
+LANGUAGE_MODULES = ('gen_api.api', 'gen_api.esp_api', 'gen_api.cat_api', 'gen_api.deu_api')
+NOT_AVAILABLE = "Function not available"
+
+@lru_cache(maxsize=None)
+def registry(module='gen_api.api'):
+    """Public functions of the four language modules by name; names defined in module take precedence"""
+    functions = {}
+    for name in (module,) + tuple(other for other in LANGUAGE_MODULES if other != module):
+        for attribute, value in vars(importlib.import_module(name)).items():
+            if inspect.isfunction(value) and value.__module__ == name and not attribute.startswith('_'):
+                functions.setdefault(attribute, value)
+    return functions
+
+class Plan:
+    """The functions requested from iterate, looked up once in the registry.
+
+    run applies them to every string of a chunk and returns one column per
+    function. The functions of one string share a cache of transcripts and
+    translations (see _core.sharing), so e.g. dna2rna and dna2amino only
+    transcribe it once.
+    """
+
+    def __init__(self, functions, module='gen_api.api'):
+        self.functions = list(functions)
+        found = registry(module)
+        self._methods = [found.get(function) for function in self.functions]
+
+    def run(self, chunk):
+        columns = [[] for _ in self._methods]
+        for string in chunk:
+            with _core.sharing():
+                for column, method in zip(columns, self._methods):
+                    column.append(method(string) if method else NOT_AVAILABLE)
+        return columns
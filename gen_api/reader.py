@@ -0,0 +1,92 @@
+import gzip
+import mmap
+from collections import namedtuple
+
+Record = namedtuple('Record', ['name', 'sequence', 'quality'])
+
+FASTA_EXTENSIONS = ('.fa', '.fasta', '.fna', '.ffn', '.faa')
+FASTQ_EXTENSIONS = ('.fq', '.fastq')
+TEXT_EXTENSIONS = ('.txt',)
+
+def _lines(path):
+    """Yields the lines of a file as bytes without their line ending.
+
+    gzip files are decompressed on the fly; uncompressed files are memory-mapped
+    so that lines are sliced straight out of the page cache.
+    """
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as file:
+            for line in file:
+                yield line.rstrip(b'\r\n')
+        return
+
+    with open(path, 'rb') as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            return
+        with mapped:
+            for line in iter(mapped.readline, b''):
+                yield line.rstrip(b'\r\n')
+
+def file_format(path):
+    """Returns 'fasta', 'fastq' or 'text' from the file extension (ignoring a trailing .gz)"""
+    name = path.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if name.endswith(FASTA_EXTENSIONS):
+        return 'fasta'
+    if name.endswith(FASTQ_EXTENSIONS):
+        return 'fastq'
+    if name.endswith(TEXT_EXTENSIONS):
+        return 'text'
+    return None
+
+def _parse_text(lines):
+    for line in lines:
+        yield Record(None, line.decode(), None)
+
+def _parse_fasta(lines):
+    name = None
+    chunks = []
+    for line in lines:
+        if line.startswith(b'>'):
+            if name is not None or chunks:
+                yield Record(name, b''.join(chunks).decode('ascii'), None)
+            name = line[1:].decode('ascii').strip()
+            chunks = []
+        elif line:
+            chunks.append(line.strip())
+    if name is not None or chunks:
+        yield Record(name, b''.join(chunks).decode('ascii'), None)
+
+def _parse_fastq(lines):
+    for header in lines:
+        if not header:
+            continue
+        if not header.startswith(b'@'):
+            raise ValueError(f'Invalid FASTQ record header: {header[:50]!r}')
+        sequence = next(lines, b'')
+        separator = next(lines, b'')
+        quality = next(lines, b'')
+        if not separator.startswith(b'+') or len(quality) != len(sequence):
+            raise ValueError(f'Truncated or malformed FASTQ record: {header[:50]!r}')
+        yield Record(header[1:].decode('ascii').strip(), sequence.decode('ascii'), quality.decode('ascii'))
+
+_PARSERS = {'text': _parse_text, 'fasta': _parse_fasta, 'fastq': _parse_fastq}
+
+def read_records(path, file_type=None):
+    """Yields Record(name, sequence, quality) tuples one at a time from a FASTA, FASTQ or txt file (optionally gzipped)"""
+    file_type = file_type or file_format(path)
+    if file_type not in _PARSERS:
+        raise ValueError("File type must be 'txt', FASTA or FASTQ")
+    try:
+        open(path, 'rb').close()
+    except OSError:
+        raise ValueError('Could not open file, please, check user guide.')
+    return _PARSERS[file_type](_lines(path))
+
+def read_sequences(path, file_type=None):
+    """Yields only the sequences of the records in a file, see read_records"""
+    for record in read_records(path, file_type):
+        yield record.sequence
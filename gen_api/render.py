@@ -0,0 +1,106 @@
+"""Headless rendering of structures to image files, one at a time or in a process pool"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import structure as _structure
+
+AXES = ('X Axis', 'Y Axis', 'Z Axis')
+ACCURACY = 'Prediction Accuracy (0%-100%)'
+
+def _check_detail(detail):
+    if detail is None or detail == 'ca':
+        return
+    if not isinstance(detail, (int, np.integer)) or isinstance(detail, bool) or detail < 1:
+        raise ValueError("detail must be None, 'ca' or a positive number of points")
+
+def level_of_detail(structure, detail=None):
+    """Returns the atoms of structure to draw: all of them (None), the CA backbone trace ('ca'),
+    or at most that many atoms evenly spread along the chain (an int)"""
+    _check_detail(detail)
+    if detail is None:
+        return structure
+    if detail == 'ca':
+        keep = np.flatnonzero(structure.atom_names == b'CA')
+    elif detail >= len(structure.coords):
+        return structure
+    else:
+        keep = np.unique(np.linspace(0, len(structure.coords) - 1, detail).astype(np.intp))
+    return _structure.Structure(*(np.ascontiguousarray(field[keep]) for field in structure))
+
+def draw(fig, structure, axes=AXES, accuracy=ACCURACY):
+    """Draws the atoms of structure on fig as a 3D scatter coloured by pLDDT, joined by the chain trace"""
+    from mpl_toolkits.mplot3d import Axes3D  # registers the 3d projection
+    from matplotlib.colors import Normalize
+    from matplotlib import cm
+
+    x_coords, y_coords, z_coords = structure.coords.T
+
+    # Normalize colors
+    norm = Normalize(vmin=0, vmax=100)
+    cmap = cm.hsv
+    colors = cmap(norm(structure.plddt))
+
+    ax = fig.add_subplot(111, projection='3d')
+    ax.scatter(x_coords, y_coords, z_coords, c=colors, s=20, alpha=0.7, edgecolors='k')
+    ax.plot(x_coords, y_coords, z_coords, color='black', linewidth=1.0, alpha=0.7)
+
+    # Add labels
+    x_label, y_label, z_label = axes
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    ax.set_zlabel(z_label)
+    cbar = fig.colorbar(cm.ScalarMappable(norm=norm, cmap=cmap), ax=ax, pad=0.1)
+    cbar.set_label(accuracy)
+    ax.grid(True)
+    return ax
+
+def render_structure(structure, path, detail='ca', dpi=100, size=(8, 6), axes=AXES, accuracy=ACCURACY):
+    """Writes an image of structure (a Structure, PDB bytes or a PDB file path) to path and returns path.
+
+    The figure is drawn on the Agg canvas directly, without pyplot, so no
+    window is opened and no display is needed; the image format follows the
+    extension of path (png, svg, pdf...). detail is passed to level_of_detail.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    if isinstance(structure, bytes):
+        structure = _structure.parse_pdb(structure)
+    elif not isinstance(structure, _structure.Structure):
+        structure = _structure.read_pdb(structure)
+
+    fig = Figure(figsize=size)
+    FigureCanvasAgg(fig)
+    draw(fig, level_of_detail(structure, detail), axes, accuracy)
+    fig.savefig(path, dpi=dpi)
+    return path
+
+def _name(item):
+    return os.path.splitext(os.path.basename(item))[0]
+
+def render_structures(structures, output_dir, detail='ca', workers=None, image_format='png', dpi=100, size=(8, 6)):
+    """Renders many structures to output_dir and returns the image paths in input order.
+
+    structures is an iterable of PDB file paths, whose images are named after
+    the files, or a dict mapping image names to a Structure, PDB bytes or path.
+    The images are rendered on a process pool of workers processes (None for
+    one per CPU, 1 to stay in this process); paths are cheaper to hand out than
+    parsed structures, as each worker then reads its own file.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be a positive integer or None")
+    _check_detail(detail)
+
+    items = structures.items() if isinstance(structures, dict) else ((_name(item), item) for item in structures)
+    jobs = [(item, os.path.join(output_dir, f'{name}.{image_format}')) for name, item in items]
+    os.makedirs(output_dir, exist_ok=True)
+
+    if workers == 1:
+        return [render_structure(item, path, detail, dpi, size) for item, path in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_structure, item, path, detail, dpi, size) for item, path in jobs]
+        return [future.result() for future in futures]
@@ -0,0 +1,175 @@
+import itertools
+from collections import deque
+
+import numpy as np
+
+from . import _core
+from .packed import BLOCK, PackedSequence
+
+def _characters(string):
+    """The characters of a str, or of a PackedSequence decoded one block at a time"""
+    if isinstance(string, PackedSequence):
+        return itertools.chain.from_iterable(block.decode('ascii') for _, block in string.blocks())
+    return string
+
+class MotifAutomaton:
+    """Aho-Corasick automaton for a fixed set of patterns.
+
+    Build it once and reuse it: every call to find scans the string a single
+    time, whatever the number of patterns, and reports overlapping matches.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(patterns))
+        if not self.patterns:
+            raise ValueError("No patterns provided, check your input.")
+        for pattern in self.patterns:
+            if not isinstance(pattern, str):
+                raise TypeError("Patterns must be of type str.")
+            if pattern == '':
+                raise ValueError("Patterns can't be empty strings.")
+
+        # trie of the patterns: transitions, failure links and the patterns ending at each state
+        self._transitions = [{}]
+        self._outputs = [[]]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in self._transitions[state]:
+                    self._transitions.append({})
+                    self._outputs.append([])
+                    self._transitions[state][char] = len(self._transitions) - 1
+                state = self._transitions[state][char]
+            self._outputs[state].append(index)
+
+        # breadth-first pass turning the trie into a complete automaton: missing transitions
+        # follow the failure link, so scanning never has to backtrack
+        alphabet = {char for pattern in self.patterns for char in pattern}
+        failure = [0] * len(self._transitions)
+        queue = deque()
+        for char in alphabet:
+            child = self._transitions[0].get(char)
+            if child is None:
+                self._transitions[0][char] = 0
+            else:
+                queue.append(child)
+        while queue:
+            state = queue.popleft()
+            self._outputs[state] = self._outputs[state] + self._outputs[failure[state]]
+            for char in alphabet:
+                child = self._transitions[state].get(char)
+                if child is None:
+                    self._transitions[state][char] = self._transitions[failure[state]][char]
+                else:
+                    failure[child] = self._transitions[failure[state]][char]
+                    queue.append(child)
+
+    def find(self, string):
+        """Returns {pattern: [(start_index, end_index), ...]} for every pattern, [] when absent.
+
+        A PackedSequence is scanned block by block instead of being decoded whole.
+        """
+        if not isinstance(string, (str, PackedSequence)):
+            raise TypeError("The searched string must be of type str.")
+
+        matches = [[] for _ in self.patterns]
+        lengths = [len(pattern) for pattern in self.patterns]
+        transitions, outputs = self._transitions, self._outputs
+        state = 0
+        for end, char in enumerate(_characters(string)):
+            state = transitions[state].get(char, 0)
+            for index in outputs[state]:
+                matches[index].append((end - lengths[index] + 1, end))
+        return dict(zip(self.patterns, matches))
+
+def find_many(string, patterns):
+    """Finds all (overlapping) occurrences of many patterns in one pass; patterns can be a list or a prebuilt MotifAutomaton"""
+    if not isinstance(patterns, MotifAutomaton):
+        patterns = MotifAutomaton(patterns)
+    return patterns.find(string)
+
+def _myers(pattern, text, max_distance, anchored=False, first_only=False):
+    """Myers' bit-parallel edit distance: [(j, distance), ...] for every text position j where the best
+    edit distance of pattern against a substring of text ending at j is at most max_distance.
+
+    With anchored=True the substring must start at text[0] instead of anywhere.
+    """
+    m = len(pattern)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    peq = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    hits = []
+    pv, mv, distance = mask, 0, m
+    for j, char in enumerate(text):
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            distance += 1
+        elif mh & high:
+            distance -= 1
+        ph = ((ph << 1) | anchored) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        if distance <= max_distance:
+            hits.append((j, distance))
+            if first_only:
+                break
+    return hits
+
+def _hamming(string, sequence, max_distance):
+    pattern = np.frombuffer(_core.as_bytes(sequence, 'Could not read provided sequence'), dtype=np.uint8)
+    if isinstance(string, PackedSequence):
+        # blocks overlap by the pattern length, and each one reports the matches starting in it
+        blocks, step = string.blocks(overlap=len(pattern) - 1), BLOCK
+    else:
+        raw = _core.as_bytes(string, 'Could not read provided string')
+        blocks, step = [(0, raw)], len(raw)
+    occurrences = []
+    for offset, block in blocks:
+        text = np.frombuffer(block, dtype=np.uint8)
+        starts = min(len(text) - len(pattern) + 1, step)
+        if starts <= 0:
+            continue
+        mismatches = np.zeros(starts, dtype=np.int32)
+        for i, base in enumerate(pattern):
+            mismatches += text[i:i+starts] != base
+        hits = np.flatnonzero(mismatches <= max_distance)
+        occurrences.extend((offset + start, offset + start + len(pattern) - 1, distance)
+                           for start, distance in zip(hits.tolist(), mismatches[hits].tolist()))
+    return occurrences
+
+def find_approx(string, sequence, max_distance=1, indels=True):
+    """Finds occurrences of sequence with up to max_distance differences: [(start_index, end_index, distance), ...]
+
+    With indels=True the distance is the edit distance (substitutions, insertions
+    and deletions, Myers' bit-parallel algorithm) and every end position within
+    max_distance is reported with the shortest alignment ending there. With
+    indels=False only substitutions are allowed (Hamming distance). Returns []
+    when nothing is found. A PackedSequence string is scanned block by block.
+    """
+    if isinstance(sequence, PackedSequence):
+        sequence = str(sequence)  # the pattern is short
+    if not isinstance(string, (str, PackedSequence)) or not isinstance(sequence, str):
+        raise TypeError("Both 'string' and 'sequence' must be of type str.")
+    if sequence == '':
+        raise ValueError("The provided sequence is empty, check your input.")
+    if not 0 <= max_distance < len(sequence):
+        raise ValueError("max_distance must be between 0 and the length of the sequence minus one.")
+    if not indels:
+        return _hamming(string, sequence, max_distance)
+
+    occurrences = []
+    reversed_sequence = sequence[::-1]
+    for end, distance in _myers(sequence, _characters(string), max_distance):
+        # scan leftwards from the end for the closest start that reaches the same distance
+        window = str(string[max(end - len(sequence) - max_distance + 1, 0):end + 1])[::-1]
+        length = _myers(reversed_sequence, window, distance, anchored=True, first_only=True)[0][0]
+        occurrences.append((end - length, end, distance))
+    return occurrences
@@ -0,0 +1,68 @@
+"""Streaming output files for iterate: rows are written batch by batch as they are computed"""
+import csv
+import json
+
+class CSVSink:
+    def __init__(self, path, columns):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file, lineterminator='\n')  # same line endings as DataFrame.to_csv
+        self._writer.writerow(columns)
+
+    def write(self, data):
+        """Appends the rows of a batch given as columns (lists of equal length) and flushes them to disk"""
+        self._writer.writerows(zip(*data))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class JSONLSink:
+    def __init__(self, path, columns):
+        self._file = open(path, 'w')
+        self._columns = columns
+
+    def write(self, data):
+        """Appends one JSON object per row, see CSVSink.write"""
+        self._file.writelines(json.dumps(dict(zip(self._columns, row)), default=str) + '\n' for row in zip(*data))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class ParquetSink:
+    """Writes every batch as a Parquet row group (needs pyarrow); the file is only readable once closed.
+
+    Every column is stored as text, like in the CSV output, so that the schema
+    is known before the first batch: a batch whose results are all None (or
+    numbers in one batch and text in the next) is written like any other.
+    """
+
+    def __init__(self, path, columns):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow, install it with 'pip install pyarrow'.")
+        self._pa = pyarrow
+        self._schema = pyarrow.schema([(column, pyarrow.string()) for column in columns])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write(self, data):
+        """Appends a row group, see CSVSink.write"""
+        pa = self._pa
+        arrays = [pa.array([None if value is None else str(value) for value in column], type=pa.string()) for column in data]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+SINKS = {'csv': CSVSink, 'jsonl': JSONLSink, 'parquet': ParquetSink}
+EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet', '.pq': 'parquet'}
+
+def open_sink(path, columns, output_format=None):
+    """Returns a sink for path; the format is 'csv', 'jsonl' or 'parquet', or taken from the file extension"""
+    if output_format is None:
+        output_format = next((name for extension, name in EXTENSIONS.items() if path.lower().endswith(extension)), None)
+    if output_format not in SINKS:
+        raise ValueError("Output format must be 'csv', 'jsonl' or 'parquet', check your filename.")
+    return SINKS[output_format](path, columns)
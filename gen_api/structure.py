@@ -0,0 +1,48 @@
+"""PDB parsing straight into NumPy arrays, for AlphaFold structures"""
+from collections import namedtuple
+
+import numpy as np
+
+Structure = namedtuple('Structure', ['coords', 'plddt', 'atom_names', 'residue_numbers', 'chains'])
+
+_LINE = 80
+# fixed PDB columns (0-based, end exclusive) of the fields read from ATOM/HETATM records
+_NAME, _ALTLOC, _CHAIN, _RESIDUE = (12, 16), 16, 21, (22, 26)
+_X, _Y, _Z, _BFACTOR = (30, 38), (38, 46), (46, 54), (60, 66)
+
+def _column(records, span):
+    return np.ascontiguousarray(records[:, span[0]:span[1]]).view(f'S{span[1] - span[0]}').ravel()
+
+def parse_pdb(data):
+    """Parses the atoms of a PDB file from its bytes (or text) without writing it to disk.
+
+    Returns Structure(coords, plddt, atom_names, residue_numbers, chains):
+    coords is a contiguous (n, 3) float32 array, plddt the float32 B-factor
+    column (the per-atom confidence in AlphaFold files), atom_names and chains
+    are bytes arrays and residue_numbers int32. Like Bio.PDB, only the first
+    model is read, and of alternate locations only the first one is kept.
+    """
+    if isinstance(data, str):
+        data = data.encode('ascii')
+    end = data.find(b'\nENDMDL')
+    if end != -1:
+        data = data[:end]
+
+    lines = [line[:_LINE].ljust(_LINE) for line in data.splitlines() if line.startswith((b'ATOM  ', b'HETATM'))]
+    records = np.frombuffer(b''.join(lines), dtype=np.uint8).reshape(-1, _LINE)
+    altloc = records[:, _ALTLOC]
+    records = records[(altloc == ord(' ')) | (altloc == ord('A'))]
+
+    coords = np.empty((len(records), 3), dtype=np.float32)
+    for axis, span in enumerate((_X, _Y, _Z)):
+        coords[:, axis] = _column(records, span).astype(np.float32)
+    return Structure(coords=coords,
+                     plddt=_column(records, _BFACTOR).astype(np.float32),
+                     atom_names=np.char.strip(_column(records, _NAME)),
+                     residue_numbers=_column(records, _RESIDUE).astype(np.int32),
+                     chains=_column(records, (_CHAIN, _CHAIN + 1)))
+
+def read_pdb(path):
+    """parse_pdb of a file on disk"""
+    with open(path, 'rb') as f:
+        return parse_pdb(f.read())
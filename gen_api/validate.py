@@ -0,0 +1,141 @@
+"""Alphabet and codon validation of one sequence or of many at once"""
+import numpy as np
+
+from . import _core
+from .packed import BLOCK, PackedSequence
+
+# one byte per character with a bit for each property the kernel needs
+_DNA, _RNA, _U, _T = 1, 2, 4, 8
+
+def _class_table(mode):
+    table = bytearray(256)
+    # lower case RNA is invalid, as in rna2amino; lower case DNA is transcribed by dna2amino, so it is valid
+    rna = _core.alphabet('RNA', mode).upper()
+    for letters, bit in ((_core.alphabet('DNA', mode), _DNA), (rna, _RNA), (b'Uu', _U), (b'Tt', _T)):
+        for letter in letters:
+            table[letter] |= bit
+    return bytes(table)
+
+# DNA codons are transcribed before the lookup and every ACGT triplet gives one of the 64 RNA codons of
+# CODON_CATALOG, so a codon is valid exactly when its three bases belong to the alphabet of the sequence
+_CLASSES = {mode: _class_table(mode) for mode in _core.MODES}
+
+def _as_raw(seq):
+    if isinstance(seq, PackedSequence):
+        return seq.to_array().tobytes()
+    if isinstance(seq, str):
+        # a non-ASCII character becomes one '?', which no alphabet accepts, so it is reported where it is
+        return seq.encode('ascii', 'replace')
+    return _core.as_bytes(seq, 'Could not read provided sequence')
+
+def first_invalid(seq, kind='DNA', mode='strict'):
+    """Position of the first character of seq outside the 'DNA' or 'RNA' alphabet, or None if it is clean.
+
+    mode is 'strict' (only the four bases, in upper or lower case) or 'iupac'
+    / 'mask', which also accept the IUPAC ambiguity codes such as N runs. A
+    non-ASCII character is invalid like any other. A PackedSequence is
+    checked block by block.
+    """
+    if kind not in ('DNA', 'RNA'):
+        raise ValueError("Sequence kind must be 'DNA' or 'RNA'")
+    allowed = _core.alphabet(kind, mode)
+    if isinstance(seq, PackedSequence):
+        for start, block in seq.blocks():
+            position = _core.first_invalid(block, allowed)
+            if position is not None:
+                return start + position
+        return None
+    return _core.first_invalid(_as_raw(seq), allowed)
+
+def codon_errors(raw, lengths, mode='strict'):
+    """Invalid codons of sequences stored back to back in raw: (sequence indexes, codon positions) arrays.
+
+    Each sequence is classified once: RNA if it has a U and no T, DNA
+    otherwise. A codon is invalid when one of its bases is not in that
+    alphabet, which takes in the IUPAC codes outside 'strict' mode; an
+    incomplete last codon is reported as invalid as well.
+    """
+    _core.check_mode(mode)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    classes = np.frombuffer(raw.translate(_CLASSES[mode]), dtype=np.uint8)
+
+    # OR and AND of the character classes of each sequence, in two passes over the bytes
+    present = np.zeros(len(lengths), dtype=np.uint8)
+    shared = np.full(len(lengths), _DNA | _RNA, dtype=np.uint8)
+    filled = np.flatnonzero(lengths)
+    if len(filled):
+        present[filled] = np.bitwise_or.reduceat(classes, starts[filled])
+        shared[filled] = np.bitwise_and.reduceat(classes, starts[filled])
+    accepted = np.where((present & _U != 0) & (present & _T == 0), _RNA, _DNA).astype(np.uint8)
+
+    # only sequences with a character outside their alphabet are looked at base by base
+    sequences = positions = np.empty(0, dtype=np.int64)
+    if np.any(shared & accepted == 0):
+        bad = np.flatnonzero(classes & np.repeat(accepted, lengths) == 0)
+        sequences = np.searchsorted(ends, bad, side='right')
+        positions = (bad - starts[sequences]) // 3 * 3
+
+    # incomplete codons at the end of the sequences whose length is not a multiple of 3
+    short = np.flatnonzero(lengths % 3)
+    sequences = np.concatenate([sequences, short])
+    positions = np.concatenate([positions, lengths[short] // 3 * 3])
+
+    # one entry per codon, in order of sequence then position
+    keys = np.unique(sequences.astype(np.int64) << 32 | positions.astype(np.int64))
+    return keys >> 32, keys & 0xFFFFFFFF
+
+def _packed_invalid_codons(seq, mode):
+    """find_invalid_codons of one PackedSequence, in two passes over its blocks instead of decoding it whole"""
+    classes_of = _CLASSES[mode]
+    block_size = BLOCK // 3 * 3  # blocks start on a codon
+    present = 0
+    for _, block in seq.blocks(block_size):
+        present |= int(np.bitwise_or.reduce(np.frombuffer(block.translate(classes_of), dtype=np.uint8)))
+    accepted = _RNA if present & _U and not present & _T else _DNA
+
+    report = []
+    for start, block in seq.blocks(block_size):
+        bad = np.flatnonzero(np.frombuffer(block.translate(classes_of), dtype=np.uint8) & accepted == 0)
+        report.extend((start + position, block[position:position + 3].decode('ascii'))
+                      for position in np.unique(bad // 3 * 3).tolist())
+    if len(seq) % 3 and (not report or report[-1][0] != len(seq) // 3 * 3):
+        report.append((len(seq) // 3 * 3, str(seq[len(seq) // 3 * 3:])))
+    return report
+
+def find_invalid_codons(seqs, mode='strict'):
+    """Returns the invalid codons of a sequence as [(position, codon), ...], or one such list per sequence for a list.
+
+    The alphabet of each sequence is classified once (RNA when it has U and
+    no T, DNA otherwise) and all codons of all the sequences are checked in
+    one vectorised pass, so millions of sequences can be validated in one
+    call. As for dna2amino and rna2amino, DNA bases may be lower case but RNA
+    bases must be upper case. position is the 0-based index of the first base
+    of the codon and codon its text in the input, also when it has non-ASCII
+    characters; a last codon with fewer than 3 bases is reported as invalid.
+    With mode 'iupac' or 'mask' codons with
+    IUPAC ambiguity codes (e.g. NNN in an assembly gap) are not reported.
+    A single PackedSequence is checked block by block; in a list it is
+    decoded to bytes like the other sequences, as they are checked together.
+    """
+    _core.check_mode(mode)
+    if isinstance(seqs, PackedSequence):
+        return _packed_invalid_codons(seqs, mode)
+    single = isinstance(seqs, (str, bytes))
+    seqs = [seqs] if single else list(seqs)
+    try:
+        # plain strings are joined and encoded once instead of one by one
+        raw = _as_raw(''.join(seqs))
+        lengths = list(map(len, seqs))
+    except TypeError:
+        raws = [_as_raw(seq) for seq in seqs]
+        raw = b''.join(raws)
+        lengths = list(map(len, raws))
+
+    report = [[] for _ in lengths]
+    for sequence, position in zip(*(array.tolist() for array in codon_errors(raw, lengths, mode))):
+        # the codon is read from the input, so that non-ASCII characters are reported as they were given
+        codon = seqs[sequence][position:position + 3]
+        report[sequence].append((position, codon.decode('ascii', 'replace') if isinstance(codon, (bytes, bytearray)) else ''.join(codon)))
+    return report[0] if single else report
@@ -0,0 +1,65 @@
+# Local stand-in for the AlphaFold API, shared by the tests and benchmarks/bench_suite.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubAlphaFold(BaseHTTPRequestHandler):
+    """One prediction per UniProt ID, with an ETag, and its PDB file.
+
+    MISSING answers 404, FLAKY 503 on its first request and OBJECT a JSON
+    object instead of a list; every request is recorded in requests as
+    (path, If-None-Match).
+    """
+    pdb = b''
+    requests = []
+
+    def do_GET(self):
+        StubAlphaFold.requests.append((self.path, self.headers.get('If-None-Match')))
+        uniprot_id = self.path.rsplit('/', 1)[-1]
+        flaky = uniprot_id == 'FLAKY' and len([r for r in StubAlphaFold.requests if r[0] == self.path]) == 1
+        if uniprot_id == 'MISSING' or flaky:
+            self.send_response(503 if flaky else 404)
+            self.end_headers()
+            return
+        if self.path.startswith('/files/'):
+            self._send(StubAlphaFold.pdb)
+            return
+        if uniprot_id == 'OBJECT':
+            self._send(b'{}')
+            return
+        etag = f'"{uniprot_id}-v1"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps([{'uniprotAccession': uniprot_id,
+                            'pdbUrl': f"http://{self.headers['Host']}/files/{uniprot_id}.pdb"}]).encode()
+        self._send(body, etag)
+
+    def _send(self, body, etag=None):
+        self.send_response(200)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    # the default backlog of 5 drops connections when fetch_predictions opens more at once
+    request_queue_size = 128
+    daemon_threads = True
+
+def start(pdb):
+    """Serves pdb for every prediction in a background thread; returns the server and its api_url template"""
+    StubAlphaFold.pdb = pdb
+    StubAlphaFold.requests = []
+    server = StubServer(('127.0.0.1', 0), StubAlphaFold)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/api/prediction/{{}}'
+
+def stop(server):
+    server.shutdown()
+    server.server_close()
@@ -1,7 +1,18 @@
 from os import supports_dir_fd
 
+import argparse
+import importlib.util
+import json
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
 import pytest
 import gen_api
+from tests import alphafold_stub as stub
 from build.lib.gen_api import dna_schneiden
 
 
@@ -201,4 +212,566 @@ def test_check_codon():
             gen_api.check_codon(string)
 
 def test_rna2dna():
-    assert gen_api.rna2dna("AUGGUGCACCUGACUCCUGAGGAGUAA") == "TACCACGTGGACTGAGGACTCCTCATT"
\ No newline at end of file
+    assert gen_api.rna2dna("AUGGUGCACCUGACUCCUGAGGAGUAA") == "TACCACGTGGACTGAGGACTCCTCATT"
+
+def test_dna2rna_lowercase_and_invalid():
+    assert gen_api.dna2rna("taccacgtgg") == "AUGGUGCACC"
+    for dna in ["TACXGT", "TACUGT", "TAC GT", "TACé"]:
+        with pytest.raises(ValueError):
+            gen_api.api.dna2rna(dna)
+
+def test_transcription_localised_modules():
+    dna = "TACCACGTGGACTGAGGACTCCTCATT"
+    rna = "AUGGUGCACCUGACUCCUGAGGAGUAA"
+    for function in [gen_api.api.dna2rna, gen_api.adn2arn, gen_api.deu_api.dna2rna]:
+        assert function(dna) == rna
+    with pytest.raises(ValueError, match="Error: no se pudo leer la secuencia de ADN."):
+        gen_api.esp_api.adn2arn("TAX")
+    assert gen_api.rna2dna(rna) == dna
+
+def test_dna2rna_numpy():
+    import numpy as np
+    dna = np.frombuffer(b"TACCACGTGGACTGAGGACTCCTCATT", dtype=np.uint8)
+    assert gen_api.dna2rna(dna).tobytes() == b"AUGGUGCACCUGACUCCUGAGGAGUAA"
+    with pytest.raises(ValueError):
+        gen_api.dna2rna(np.frombuffer(b"TACN", dtype=np.uint8))
+
+def test_packed_sequence():
+    dna = "TACCACGTGGACTGAGGACTCCTCATT"
+    packed = gen_api.PackedSequence(dna)
+    assert len(packed) == len(dna) and str(packed) == dna
+    assert packed.nbytes < len(dna)
+    assert str(packed[5:18]) == dna[5:18] and packed[-1] == dna[-1]
+    assert packed[5:18]._data is packed._data  # slices are views on the same buffer
+
+    mixed = gen_api.PackedSequence("ACGTNNacgt")
+    assert str(mixed) == "ACGTNNacgt" and str(mixed[3:8]) == "TNNac"
+
+def test_packed_sequence_functions():
+    dna = "TACCACGTGGACTGAGGACTCCTCATT"
+    rna = gen_api.dna2rna(gen_api.PackedSequence(dna))
+    assert isinstance(rna, gen_api.PackedSequence) and rna == "AUGGUGCACCUGACUCCUGAGGAGUAA"
+    assert gen_api.dna2rna(gen_api.PackedSequence(dna)[3:]) == gen_api.dna2rna(dna[3:])
+    assert gen_api.rna2dna(rna) == dna
+    assert gen_api.rna2amino(rna) == gen_api.dna2amino(gen_api.PackedSequence(dna)) == " Met Val His Leu Thr Pro Glu Glu"
+    assert gen_api.find(gen_api.PackedSequence(dna), "GAC") == gen_api.find(dna, "GAC")
+    assert gen_api.compare(gen_api.PackedSequence(dna), "TACCACGTGGAGTGAGGACTCCTCATT") == "Difference in 12 base/aminoacid"
+    assert gen_api.check_codon(gen_api.PackedSequence("ATGCGATAA")) == []
+    with pytest.raises(ValueError):
+        gen_api.dna2rna(gen_api.PackedSequence("TACNNN"))
+
+def test_packed_sequence_blocks(monkeypatch):
+    # long PackedSequences are read block by block, never decoded into one str
+    block = gen_api.packed.BLOCK
+    dna = "A" * (block - 2) + "CGTACNA" + "ACG" * 40000 + "UUA"
+    packed = gen_api.PackedSequence(dna)
+    decode = gen_api.PackedSequence.__str__
+    def short_only(seq):
+        assert len(seq) <= block, "a long PackedSequence was decoded whole"
+        return decode(seq)
+    monkeypatch.setattr(gen_api.PackedSequence, "__str__", short_only)
+    assert [start for start, _ in packed.blocks(block, overlap=4)] == [0, block, 2 * block]
+    assert gen_api.api.find(packed, "CGTAC") == gen_api.api.find(dna, "CGTAC") == [(block - 2, block + 2)]
+    assert gen_api.find_many(packed, ["GTACN", "UUA"]) == gen_api.find_many(dna, ["GTACN", "UUA"])
+    assert gen_api.find_approx(packed, "CGTAG", 1) == gen_api.find_approx(dna, "CGTAG", 1)
+    assert gen_api.find_approx(packed, "CGTAG", 1, indels=False) == gen_api.find_approx(dna, "CGTAG", 1, indels=False)
+    assert gen_api.validate.first_invalid(packed) == block + 3
+    assert gen_api.find_invalid_codons(packed) == gen_api.find_invalid_codons(dna)
+    assert gen_api.api.check_codon(packed) == gen_api.api.check_codon(dna) == ["CNA", "UUA"]
+    assert list(gen_api.scan_cut_sites(packed)) == list(gen_api.scan_cut_sites(dna))
+
+def test_read_records_fasta():
+    records = gen_api.read_records('./tests/test.fasta')
+    assert next(records) == ('HBB fragment 1', 'TACCACGTGGACTGAGGACTCCTCATT', None)
+    assert next(records).sequence == 'TACCACGTCTGAGGACTCCTCATT'
+    assert next(records, None) is None
+
+def test_read_records_fastq_gzip(tmp_path):
+    import gzip
+    path = str(tmp_path / 'reads.fastq.gz')
+    with gzip.open(path, 'wt') as f:
+        f.write('@read1\nTACCACGTG\n+\nIIIIIIIII\n@read2\nTACGTG\n+\nIIIIII\n')
+    assert list(gen_api.read_sequences(path)) == ['TACCACGTG', 'TACGTG']
+    assert [record.quality for record in gen_api.read_records(path)] == ['IIIIIIIII', 'IIIIII']
+
+def test_iterate_fasta_path(tmp_path):
+    df = gen_api.iterate('./tests/test.fasta', ['dna2rna'], filepath=str(tmp_path))
+    assert list(df['dna2rna']) == ['AUGGUGCACCUGACUCCUGAGGAGUAA', 'AUGGUGCAGACUCCUGAGGAGUAA']
+
+def test_iterate_txt_path(tmp_path, monkeypatch):
+    # a txt file is read line by line as the rows are processed, not loaded as a list first
+    read_sequences = gen_api.reader.read_sequences
+    opened = []
+    monkeypatch.setattr(gen_api.reader, "read_sequences", lambda *args: opened.append(args) or read_sequences(*args))
+    df = gen_api.iterate('./tests/test.txt', ['dna2rna'], filepath=str(tmp_path))
+    assert opened == [('./tests/test.txt', 'text')]
+    assert list(df['input']) == gen_api.read_input('./tests/test.txt') and len(df) == 4
+    with pytest.raises(ValueError, match="No input sequences provided, check your input."):
+        gen_api.iterate('', ['dna2rna'], filepath=str(tmp_path))
+
+def test_rna2amino_vectorised():
+    rna = "AUGGUGCACCUGACUCCUGAGGAG" * 100
+    assert gen_api.rna2amino(rna) == " Met Val His Leu Thr Pro Glu Glu" * 100
+    assert gen_api.rna2amino(rna + "UAA" + "XYZ" * 100) == " Met Val His Leu Thr Pro Glu Glu" * 100  # stops at the first STOP
+    with pytest.raises(ValueError, match="Error: invalid codon XYZ"):
+        gen_api.rna2amino(rna + "XYZ" + "UAA" * 100)
+    with pytest.raises(ValueError, match="Error: codón invalido AXG"):
+        gen_api.esp_api.arn2amino("AUGAXG")
+    assert gen_api.dna2amino(gen_api.rna2dna(rna)) == gen_api.adn2amino(gen_api.rna2dna(rna))
+
+def test_find_orfs():
+    dna = "TACCACGTGGACTGAGGACTCCTCATT"
+    assert gen_api.find_orfs(dna) == [('+', 0, 0, 26, " Met Val His Leu Thr Pro Glu Glu")]
+    # the same gene on the other strand, behind an N run that closes every frame
+    other_strand = "AUGGUGCACCUGACUCCUGAGGAGUAA"[::-1].replace("U", "T")
+    orfs = gen_api.find_orfs("TACNNN" + other_strand)
+    assert orfs == [('-', 0, 6, 32, " Met Val His Leu Thr Pro Glu Glu")]
+    assert gen_api.find_orfs(dna, min_len=9) == []
+
+def test_iter_orfs_streaming():
+    dna = "GGTACCACGTGGACTGAGGACTCCTCATTGG" * 50
+    chunks = [dna[i:i+7] for i in range(0, len(dna), 7)]
+    assert sorted(gen_api.iter_orfs(chunks)) == sorted(gen_api.find_orfs(dna))
+
+def test_find_many():
+    string = "TACCACGTGGACTGAGGACTCCTCATT"
+    result = gen_api.find_many(string, ["GAC", "GGAC", "CC", "AAAA"])
+    assert result["GAC"] == gen_api.find(string, "GAC")
+    assert result["GGAC"] == [(8, 11), (15, 18)]
+    assert gen_api.find_many("ACCCA", ["CC"]) == {"CC": [(1, 2), (2, 3)]}  # overlapping matches included
+    assert result["AAAA"] == []  # missing patterns don't raise
+
+    automaton = gen_api.MotifAutomaton(["TAC", "CAT"])
+    assert gen_api.find_many(string, automaton) == automaton.find(string) == {"TAC": [(0, 2)], "CAT": [(23, 25)]}
+    with pytest.raises(ValueError):
+        gen_api.MotifAutomaton(["TAC", ""])
+
+def test_sequence_index(tmp_path):
+    reference = "TACCACGTGGACTGAGGACTCCTCATT" * 20
+    index = gen_api.SequenceIndex(reference, sample_rate=4)
+    assert index.count("GGAC") == 40 and index.count("AAAA") == 0
+    assert gen_api.find(index, "GGAC") == gen_api.find(reference, "GGAC")
+    with pytest.raises(ValueError, match="Sequence could not be found in your global string."):
+        gen_api.find(index, "AAAA")
+
+    index.save(str(tmp_path / "index"))
+    loaded = gen_api.SequenceIndex.load(str(tmp_path / "index"))
+    assert loaded.locate("TCATTTAC") == index.locate("TCATTTAC") == [22 + 27 * i for i in range(19)]
+
+def test_find_approx():
+    string = "TACCACGTGGACTGAGGACTCCTCATT"
+    # one substitution away (GGAC -> GAAC) and one insertion away (GAG -> GAAG)
+    assert gen_api.find_approx(string, "GAAC", 1, indels=False) == [(8, 11, 1), (15, 18, 1)]
+    assert (13, 15, 1) in gen_api.find_approx(string, "GAAG", 1)
+    assert [hit for hit in gen_api.find_approx(string, "GGACT", 1) if hit[2] == 0] == [(8, 12, 0), (15, 19, 0)]
+    assert gen_api.find_approx(string, "AAAAAA", 2) == []
+    with pytest.raises(ValueError):
+        gen_api.find_approx(string, "GAC", 3)
+
+def test_compare_full():
+    original = "TACCACGTGGACTGAGGACTCCTCATT"
+    report = gen_api.compare_full(original, "TACCACGTGGAGTGAGGACTCCTCAG")
+    assert report["identical"] is False and report["hamming"] == 2 and report["compared"] == 26
+    assert report["positions"].tolist() == [11, 25] and report["length_difference"] == -1
+    assert report["substitutions"] == {"C>G": 1, "T>G": 1}
+    assert gen_api.compare_full(original, original)["identical"]
+
+    long = original * 10000
+    assert gen_api.compare(long, long[:-1] + "A") == f"Difference in {len(long)} base/aminoacid"
+    assert gen_api.identical(long, gen_api.PackedSequence(long)) and not gen_api.identical(long, long[1:])
+
+def test_compare_lists():
+    # lists are compared item by item, as amino acid names are longer than one character
+    assert gen_api.api.compare(["Met", "Val"], ["Met", "Leu"]) == "Difference in 2 base/aminoacid"
+    assert gen_api.api.compare(["Met", "Val"], ["Met", "Leucine"]) == "Difference in 2 base/aminoacid"
+    assert gen_api.api.compare(["Met", "Val"], ["Met", "Val"]) == "Identical"
+    assert gen_api.identical(list("TAC"), "TAC") and not gen_api.identical(["Met"], ["Val"])
+
+def test_iterate_parallel(tmp_path):
+    strings = ["TACCACGTGGACTGAGGACTCCTCATT", "TACCACGTC", "TTT", "TACGGGATT", "ATG"] * 7
+    functions = ["dna2rna", "dna2amino", "unknown"]
+    serial = gen_api.iterate(strings, functions, filepath=str(tmp_path))
+    for executor in ("thread", "process"):
+        parallel = gen_api.iterate(strings, functions, filepath=str(tmp_path), workers=2, executor=executor, chunk_size=3)
+        assert parallel.equals(serial)
+    assert serial["input"].tolist() == strings
+    with pytest.raises(ValueError):
+        gen_api.iterate(strings, functions, filepath=str(tmp_path), executor="cluster")
+
+def test_iterate_stream(tmp_path):
+    strings = ["TACCACGTGGACTGAGGACTCCTCATT", "TACCACGTC", "TTT"] * 5
+    functions = ["dna2rna", "dna2amino"]
+    df = gen_api.iterate(strings, functions, filepath=str(tmp_path), filename="all.csv")
+    path = gen_api.iterate(strings, functions, filepath=str(tmp_path), stream=True, chunk_size=4)
+    with open(path) as streamed, open(str(tmp_path / "all.csv")) as full:
+        assert streamed.read() == full.read()
+    path = gen_api.iterate(strings, functions, filepath=str(tmp_path), filename="results.jsonl", stream=True, chunk_size=4)
+    with open(path) as f:
+        assert [json.loads(line)["dna2amino"] for line in f] == df["dna2amino"].tolist()
+
+    def interrupted():
+        yield from strings[:8]
+        raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        gen_api.iterate(interrupted(), functions, filepath=str(tmp_path), filename="partial.csv", stream=True, chunk_size=4)
+    with open(str(tmp_path / "partial.csv")) as f:
+        assert len(f.readlines()) == 9  # header and the finished batches are already on disk
+    with pytest.raises(ValueError):
+        gen_api.iterate(strings, functions, filepath=str(tmp_path), filename="results.xlsx", stream=True)
+
+def test_parquet_sink(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    # a first batch whose results are all None must not fix a null type for the later batches
+    output = gen_api.sink.open_sink(str(tmp_path / "results.parquet"), ["input", "find", "check_codon"])
+    output.write([["TAC", "GGG"], [None, None], [[], ["GGG"]]])
+    output.write([["TACCAC"], [[(0, 2)]], [None]])
+    output.close()
+    table = pq.read_table(str(tmp_path / "results.parquet"))
+    assert [str(kind) for kind in table.schema.types] == ["string"] * 3
+    assert table.to_pydict() == {"input": ["TAC", "GGG", "TACCAC"], "find": [None, None, "[(0, 2)]"],
+                                 "check_codon": ["[]", "['GGG']", None]}
+
+def test_iterate_plan(tmp_path, monkeypatch):
+    strings = ["TACCACGTGGACTGAGGACTCCTCATT", "TACCACGTC"]
+    df = gen_api.iterate(strings, ["dna2rna", "adn2arn", "adn2amino"], filepath=str(tmp_path))  # Spanish names too
+    assert df["adn2arn"].tolist() == df["dna2rna"].tolist() and df["adn2amino"][1] == " Met Val Gln"
+
+    calls = []
+    transcribe = gen_api._core._transcribe
+    monkeypatch.setattr(gen_api._core, "_transcribe", lambda *args: calls.append(args) or transcribe(*args))
+    gen_api.iterate(strings, ["dna2rna", "dna2amino", "adn2amino"], filepath=str(tmp_path))
+    assert len(calls) == len(strings)  # one transcription per input, shared by the three functions
+
+def test_import_is_lazy():
+    # heavy dependencies are only imported by iterate, alphafold_prediction and generate_protein
+    probe = "import sys, gen_api; print(','.join(sorted(m for m in ('pandas', 'requests', 'matplotlib') if m in sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == ""
+
+def test_localised_facades(tmp_path):
+    # same engine as the English functions, with the messages of each language
+    assert gen_api.esp_api.comparar("TACCAC", "TACGAC") == "Diferencia en la 4 base/aminoácido"
+    assert gen_api.esp_api.comprueba_codon("TACXXXATT") == gen_api.check_codon("TACXXXATT") == ["XXX"]
+    assert gen_api.deu_api.dna_reparieren("TAC|GG", "HDR", neue_string="AA") == gen_api.repair_dna("TAC|GG", "HDR", repair_sequence="AA")
+    assert list(gen_api.cat_api.llegir_input("./tests/test.fasta")) == list(gen_api.read_input("./tests/test.fasta"))
+    with pytest.raises(ValueError, match="La seqüència no és a la string global."):
+        gen_api.cat_api.buscar("TACCAC", "GGG")
+    df = gen_api.deu_api.iterieren(["TACCACGTC"], ["dna2amino", "zueinfach", "unbekannt"], filepath=str(tmp_path))
+    assert df.values.tolist() == [["TACCACGTC", " Met Val Gln", "T", "Function not available"]]
+
+_PDB = """HEADER    STRUCTURE PREDICTION
+ATOM      1  N   MET A   1      -1.500   2.250  10.000  1.00 35.50           N
+ATOM      2  CA  MET A   1      -0.500   2.750  11.125  1.00 41.00           C
+ATOM      3  CA ASER A   2       1.000   3.000  12.000  0.50 90.00           C
+ATOM      4  CA BSER A   2       9.000   9.000   9.000  0.50 10.00           C
+HETATM    5  O   HOH B 101       4.000  -5.000   6.000  1.00 70.25           O
+ENDMDL
+MODEL        2
+ATOM      6  CA  MET A   1       0.000   0.000   0.000  1.00 99.00           C
+END
+"""
+
+def test_parse_pdb(tmp_path):
+    structure = gen_api.parse_pdb(_PDB)
+    assert structure.coords.dtype == "float32" and structure.coords.shape == (4, 3)
+    assert structure.coords[1].tolist() == [-0.5, 2.75, 11.125]
+    assert structure.plddt.tolist() == [35.5, 41.0, 90.0, 70.25]  # altloc B and the second model are skipped
+    assert structure.atom_names.tolist() == [b"N", b"CA", b"CA", b"O"]
+    assert structure.residue_numbers.tolist() == [1, 1, 2, 101]
+    assert structure.chains.tolist() == [b"A", b"A", b"A", b"B"]
+    (tmp_path / "model.pdb").write_text(_PDB)
+    assert gen_api.read_pdb(tmp_path / "model.pdb").coords.tolist() == structure.coords.tolist()
+
+@pytest.fixture
+def alphafold_stub():
+    server, api_url = stub.start(_PDB.encode())
+    yield api_url
+    stub.stop(server)
+
+def test_alphafold_cache(tmp_path, alphafold_stub):
+    client = gen_api.AlphaFoldClient(cache_dir=str(tmp_path / "cache"), api_url=alphafold_stub)
+    assert client.prediction("P69905")[1]["uniprotAccession"] == "P69905"
+    assert client.prediction("P69905")[0] == 200
+    assert len(stub.StubAlphaFold.requests) == 1  # second call served from the cache
+
+    client.ttl = 0  # stale entries are revalidated with their ETag
+    assert client.prediction("P69905")[1]["uniprotAccession"] == "P69905"
+    assert stub.StubAlphaFold.requests[-1][1] == '"P69905-v1"'
+    assert client.prediction("MISSING") == (404, None)
+
+    client.ttl = 3600
+    client.max_size = 2 * client.cache_size() + 10  # room for two entries: the least recently used one goes
+    client.prediction("P68871")
+    client.prediction("P02100")
+    assert client.cache_size() <= client.max_size
+    fetched = len(stub.StubAlphaFold.requests)
+    client.prediction("P02100")
+    client.prediction("P69905")
+    assert len(stub.StubAlphaFold.requests) == fetched + 1
+
+    gen_api.fetch.configure(cache_dir=str(tmp_path / "cache"), api_url=alphafold_stub)
+    assert gen_api.alphafold_prediction("P02100")["uniprotAccession"] == "P02100"
+    with pytest.raises(ValueError, match="Failed to fetch data: 404"):
+        gen_api.alphafold_prediction("MISSING")
+    gen_api.fetch.configure()
+
+def test_fetch_predictions(tmp_path, alphafold_stub):
+    client = gen_api.AlphaFoldClient(cache_dir=str(tmp_path / "cache"), api_url=alphafold_stub)
+    ids = [f"P{i:05d}" for i in range(20)] + ["FLAKY", "MISSING", "OBJECT"]
+    start = time.perf_counter()
+    results = list(gen_api.fetch_predictions(ids, concurrency=4, rate_limit=100, backoff=0.01, client=client))
+    assert time.perf_counter() - start >= 0.2  # 24 requests at no more than 100 per second
+    assert sorted(result.uniprot_id for result in results) == sorted(ids)
+    failed = {result.uniprot_id: result.error for result in results if result.error}
+    # the 503 of FLAKY was retried, and an unexpected payload fails its ID only
+    assert failed == {"MISSING": "Failed to fetch data: 404", "OBJECT": "Invalid response from the server"}
+    assert all(result.prediction["uniprotAccession"] == result.uniprot_id for result in results if not result.error)
+
+def test_generate_protein(tmp_path, alphafold_stub):
+    import matplotlib
+    matplotlib.use("Agg")
+    gen_api.fetch.configure(cache_dir=str(tmp_path / "cache"), api_url=alphafold_stub)
+    try:
+        prediction = gen_api.alphafold_prediction("P69905")
+        structure = gen_api.api.generate_protein(prediction, filepath=str(tmp_path / "P69905.pdb"), show=False)
+    finally:
+        gen_api.fetch.configure()
+    assert structure.plddt.tolist() == [35.5, 41.0, 90.0, 70.25]
+    assert (tmp_path / "P69905.pdb").read_text() == _PDB
+
+def test_render_structures(tmp_path, alphafold_stub):
+    structure = gen_api.parse_pdb(_PDB)
+    assert gen_api.level_of_detail(structure, "ca").atom_names.tolist() == [b"CA", b"CA"]
+    assert gen_api.level_of_detail(structure, 2).plddt.tolist() == [35.5, 70.25]  # first and last atom
+    assert gen_api.level_of_detail(structure, 10) is structure
+    with pytest.raises(ValueError):
+        gen_api.level_of_detail(structure, 0)
+
+    (tmp_path / "a.pdb").write_text(_PDB)
+    (tmp_path / "b.pdb").write_text(_PDB)
+    paths = gen_api.render_structures([str(tmp_path / "a.pdb"), str(tmp_path / "b.pdb")], str(tmp_path / "images"), workers=2)
+    assert paths == [str(tmp_path / "images" / "a.png"), str(tmp_path / "images" / "b.png")]
+    assert all(open(path, "rb").read(8) == b"\x89PNG\r\n\x1a\n" for path in paths)
+    assert gen_api.render_structures({"c": structure}, str(tmp_path / "images"), detail=3, workers=1, image_format="svg") == [str(tmp_path / "images" / "c.svg")]
+
+    gen_api.fetch.configure(cache_dir=str(tmp_path / "cache"), api_url=alphafold_stub)
+    try:
+        prediction = gen_api.alphafold_prediction("P69905")
+        gen_api.api.generate_protein(prediction, filepath=None, image=str(tmp_path / "P69905.png"), detail="ca")
+        # the localised facades render headless with the same options
+        gen_api.esp_api.generar_proteina(prediction, filepath=None, imagen=str(tmp_path / "es.png"), detalle="ca")
+        gen_api.cat_api.generar_proteina(prediction, filepath=None, imatge=str(tmp_path / "ca.png"), detall=2)
+        gen_api.deu_api.protein_generieren(prediction, filepath=None, bild=str(tmp_path / "de.png"), detailgrad="ca")
+    finally:
+        gen_api.fetch.configure()
+    assert all((tmp_path / name).stat().st_size > 0 for name in ("P69905.png", "es.png", "ca.png", "de.png"))
+
+def test_create_mutations():
+    dna = "TACCACGTGGACTGAGGACTCCTCATT"
+    mutants = gen_api.create_mutations(dna, 20000, seed=1)
+    assert len(mutants) == 20000
+    assert all(mutant != dna for mutant in mutants)
+    assert list(gen_api.create_mutations(dna, 50, seed=7)) == list(gen_api.create_mutations(dna, 50, seed=7))
+
+    kinds = np.bincount(mutants.kinds, minlength=7) / len(mutants)
+    assert abs(kinds[1] - 0.75) < 0.02 and abs(kinds[5] - 0.15) < 0.02 and abs(kinds[6] - 0.10) < 0.02
+    insertions = mutants.lengths[mutants.kinds == 6]
+    assert abs(np.mean(insertions == 1) - 0.7) < 0.05
+    substituted = [(dna[i], chr(b)) for i, b in zip(mutants.positions[mutants.kinds == 1], mutants.bases[mutants.kinds == 1, 0])]
+    transitions = sum((a + b) in ("AG", "GA", "CT", "TC") for a, b in substituted)
+    assert abs(transitions / len(substituted) - 0.5) < 0.02  # 2:1 over each of the two transversions
+
+    single = gen_api.create_mutations("A", 100, seed=0)
+    assert "A" not in set(single)
+    with pytest.raises(ValueError):
+        gen_api.create_mutations("", 1)
+
+def test_evolve():
+    dna = "TACCACGTGGACTGAGGACTCCTCATT" * 100
+    history = list(gen_api.evolve(dna, 50, 0.001, every=10, seed=3))
+    assert [record.generation for record in history] == [10, 20, 30, 40, 50]
+    assert all(record.sequence is None for record in history[:-1])
+    last = history[-1]
+    assert len(last.sequence) == last.length
+    assert last.substitutions > 0 and last.deletions + last.insertions > 0
+    assert last.gc == (last.sequence.count("G") + last.sequence.count("C")) / last.length
+    assert last.sequence != dna
+    assert list(gen_api.evolve(dna, 50, 0.001, every=10, seed=3)) == history
+
+    # the running GC count matches a recount of every snapshot
+    for record in gen_api.evolve(dna, 30, 0.01, seed=5, snapshots=True):
+        assert record.gc == (record.sequence.count("G") + record.sequence.count("C")) / record.length
+
+    snapshots = list(gen_api.evolve("ACGT", 3, 0, snapshots=True))
+    assert [record.sequence for record in snapshots] == ["ACGT"] * 3  # rate 0 leaves the sequence untouched
+    with pytest.raises(ValueError):
+        list(gen_api.evolve(dna, 10, 2))
+
+def test_editable_sequence():
+    dna = "TACCACGTGGACTGAGGACTCCTCATT"
+    edited = gen_api.EditableSequence(dna)
+    expected = dna
+    for cut_pos, repair_type, repair_sequence in [(5, "NHEJ", None), (0, "HDR", "GGG"), (12, "HDR", "AT"), (28, "NHEJ", None)]:
+        expected = gen_api.repair_dna(gen_api.cut_dna(expected, cut_pos), repair_type, repair_sequence=repair_sequence)
+        assert gen_api.api.repair_dna(gen_api.api.cut_dna(edited, cut_pos), repair_type, repair_sequence=repair_sequence) is edited
+    assert str(edited) == expected and len(edited) == len(expected)
+
+    edited.insert(len(edited), "CCC").delete(0, 4)
+    assert str(edited) == expected[4:] + "CCC"
+    with pytest.raises(ValueError, match="Cut position is out of bounds."):
+        gen_api.api.cut_dna(edited, len(edited))
+    with pytest.raises(ValueError, match="Invalid repair type"):
+        gen_api.api.repair_dna(edited, "HDR")  # no pending cut and no repair sequence
+
+    rng = np.random.default_rng(0)
+    reference, edited = bytearray(b"ACGT" * 500), gen_api.EditableSequence("ACGT" * 500)
+    for _ in range(300):
+        pos = int(rng.integers(0, len(reference)))
+        draw = rng.random()
+        if draw < 0.4:
+            del reference[pos:pos + 3]
+            edited.delete(pos, 3)
+        elif draw < 0.8:
+            reference[pos:pos] = b"TTA"
+            edited.insert(pos, "TTA")
+        else:
+            reference[pos] = ord("G")
+            edited.replace(pos, "G")
+        assert edited[pos % len(edited)] == chr(reference[pos % len(reference)])
+    assert edited.to_bytes() == bytes(reference)
+    with pytest.raises(ValueError):
+        edited.replace(0, "GG")
+
+    # editing leaves the global random generator, used by createmutation, where random.seed put it
+    random.seed(7)
+    expected = [random.random() for _ in range(3)]
+    random.seed(7)
+    gen_api.EditableSequence("ACGT" * 10).insert(4, "GG").delete(10, 2).insert(0, "T")
+    assert [random.random() for _ in range(3)] == expected
+
+def test_scan_cut_sites():
+    rng = np.random.default_rng(5)
+    dna = "".join(rng.choice(list("ACGT"), 3000))
+    complement = str.maketrans("ACGT", "TGCA")
+    expected = set()
+    for pam in ("AGG", "CGG", "GGG", "TGG"):
+        for start in gen_api.find(dna, pam) if pam in dna else []:
+            if start[0] >= 20:
+                expected.add((start[0] - 3, "+", start[0], dna[start[0] - 20:start[0]], pam))
+        reverse = pam.translate(complement)[::-1]
+        for start in gen_api.find(dna, reverse) if reverse in dna else []:
+            if start[0] + 23 <= len(dna):
+                expected.add((start[0] + 6, "-", start[0], dna[start[0] + 3:start[0] + 23].translate(complement)[::-1], pam))
+    sites = list(gen_api.scan_cut_sites(dna))
+    assert set(sites) == expected and len(sites) == len(expected)
+    assert [site.pam_start - 20 * (site.strand == "+") for site in sites] == sorted(site.pam_start - 20 * (site.strand == "+") for site in sites)
+
+    chunks = (dna[i:i + 97] for i in range(0, len(dna), 97))  # streamed input gives the same sites
+    assert list(gen_api.scan_cut_sites(chunks)) == sites
+    assert list(gen_api.scan_cut_sites(dna, block_size=50)) == sites
+    assert set(gen_api.scan_cut_sites(dna, pam="NRG")) >= set(sites)
+
+    site = sites[0]
+    cut = gen_api.api.cut_dna(dna, site)
+    assert cut.index("|") == site.cut
+    assert gen_api.api.repair_dna(cut, "NHEJ") == dna[:site.cut] + dna[site.cut + 1:]
+    with pytest.raises(ValueError):
+        next(gen_api.scan_cut_sites(dna, pam="NGX"))
+
+def test_find_invalid_codons():
+    assert gen_api.check_codon("AUGGCCUAA") == []  # RNA is no longer complemented letter by letter
+    assert gen_api.check_codon("AUGTCCUAA") == ["AUG", "UAA"]  # with a T the string is DNA, so U is invalid
+    assert gen_api.check_codon("atgNNacgt") == ["NNa"]
+    assert gen_api.find_invalid_codons("ATGXXXATANGG") == [(3, "XXX"), (9, "NGG")]
+    assert gen_api.find_invalid_codons(["ATGCGA", "", "AUGXUA", "ATGCG", "tacgga"]) == [[], [], [(3, "XUA")], [(3, "CG")], []]
+    # the same case rule as the translation: lower case DNA is read, lower case RNA is not
+    assert gen_api.api.dna2amino("tacgga") == " Met Pro" and gen_api.api.check_codon("tacgga") == []
+    with pytest.raises(ValueError, match="invalid codon aug"):
+        gen_api.api.rna2amino("augccu")
+    assert gen_api.api.check_codon("augccu") == ["aug", "ccu"] and gen_api.api.check_codon("AUGccu") == ["ccu"]
+    # non-ASCII characters are reported in their codon by every language module
+    assert gen_api.api.check_codon("TACXéXATT") == gen_api.esp_api.comprueba_codon("TACXéXATT") == ["XéX"]
+    assert gen_api.find_invalid_codons(["AUGéCU", b"TACGGA"]) == [[(3, "éCU")], []]
+    assert gen_api.first_invalid("ACGé") == 3
+    assert gen_api.find_invalid_codons(["ACG"] * 100000 + ["ACU"]) == [[]] * 100000 + [[]]
+
+def test_alphabet_modes():
+    assembly = "TACNNNNRYACGT"
+    with pytest.raises(ValueError, match=r"Could not read provided DNA string \(invalid character at position 3\)"):
+        gen_api.api.dna2rna(assembly)
+    assert gen_api.api.dna2rna(assembly, mode="iupac") == "AUGNNNNYRUGCA"
+    assert gen_api.api.dna2rna(assembly, mode="mask") == "AUGNNNNNNUGCA"
+    assert gen_api.api.rna2dna("AUGNNN", mode="iupac") == "TACNNN"
+    with pytest.raises(ValueError, match=r"invalid character at position 2"):
+        gen_api.api.dna2rna(assembly[:2] + "é" + assembly[3:])
+    with pytest.raises(ValueError, match=r"no se pudo leer la secuencia de ADN. \(carácter no válido en la posición 3\)"):
+        gen_api.esp_api.adn2arn(assembly)
+    with pytest.raises(ValueError, match=r"position 1\)"):
+        gen_api.api.dna2rna(gen_api.PackedSequence("AXGT"))
+    with pytest.raises(ValueError):
+        gen_api.api.dna2rna(assembly, mode="loose")
+    # codons with ambiguity codes are translated as Xaa outside strict mode, on both translation paths
+    assert gen_api.api.dna2amino("TACNNNATT", mode="iupac") == gen_api.api.dna2amino("TACNNNATT", mode="mask") == " Met Xaa"
+    assert gen_api.api.dna2amino("TAC" + "NNNGGG" * 100 + "ATT", mode="iupac") == " Met" + " Xaa Pro" * 100
+    with pytest.raises(ValueError, match="invalid character at position 3"):
+        gen_api.api.dna2amino("TACNNNATT")
+    # the localised facades take the mode too, and the package-level names resolve to them
+    assert gen_api.dna2rna("TACNNN", mode="iupac") == "AUGNNN" and gen_api.dna2amino("TACNNNATT", mode="mask") == " Met Xaa"
+    assert gen_api.esp_api.adn2amino("TACNNNATT", modo="iupac") == gen_api.cat_api.adn2amino("TACNNNATT", mode="iupac") == " Met Xaa"
+    assert gen_api.deu_api.codon_checken("ATGNNNTAA", modus="mask") == gen_api.esp_api.comprueba_codon("ATGNNNTAA", modo="mask") == []
+
+    # a PackedSequence stays packed in every mode
+    for mode in ("iupac", "mask"):
+        rna = gen_api.api.dna2rna(gen_api.PackedSequence(assembly), mode=mode)
+        assert isinstance(rna, gen_api.PackedSequence) and rna.kind == "RNA" and rna == gen_api.api.dna2rna(assembly, mode=mode)
+        assert gen_api.api.rna2dna(rna, mode=mode) == gen_api.api.rna2dna(str(rna), mode=mode)
+    with pytest.raises(ValueError, match=r"position 1\)"):
+        gen_api.api.dna2rna(gen_api.PackedSequence("AXGT"), mode="iupac")
+
+    assert gen_api.first_invalid("ACGTACGT") is None
+    assert gen_api.first_invalid("ACGTNACGX") == 4
+    assert gen_api.first_invalid("ACGTNACGX", mode="iupac") == 8
+    assert gen_api.first_invalid("ACGUACGT", kind="RNA") == 7
+
+    with pytest.raises(ValueError, match=r"Could not read provided DNA string \(invalid character at position 3\)"):
+        gen_api.api.check("TACXGGATT")
+    assert gen_api.api.check("TACNGGATT", mode="iupac") == "Valid DNA string"
+    assert gen_api.api.check_codon("ATGNNNTAA") == ["NNN"]
+    assert gen_api.api.check_codon("ATGNNNTAA", mode="mask") == []
+    assert gen_api.find_invalid_codons(["AUGNNN", "ACGXNN"], mode="iupac") == [[], [(3, "XNN")]]
+
+def _bench_suite():
+    # loaded from its path, so the test does not depend on the working directory
+    spec = importlib.util.spec_from_file_location("bench_suite", Path(__file__).parent.parent / "benchmarks" / "bench_suite.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_bench_suite_regressions():
+    # the comparison with the baseline, on made-up throughputs: no timing runs in the tests
+    bench = _bench_suite()
+    baseline = {"dna2rna/1kb": 100.0, "compare/1kb": 100.0, "cut_dna/repair_dna/1kb": 100.0, "fetch_predictions": 10.0}
+    throughputs = {"dna2rna/1kb": 40.0, "compare/1kb": 60.0, "cut_dna/repair_dna/1kb": 10.0, "fetch_predictions": 4.0, "find/1kb": 1.0}
+    assert bench.regressions(throughputs, baseline, 0.5, {}) == {"dna2rna/1kb": 0.4, "cut_dna/repair_dna/1kb": 0.1, "fetch_predictions": 0.4}
+    assert bench.regressions(throughputs, baseline, 0.3, {}) == {"dna2rna/1kb": 0.4, "compare/1kb": 0.6,
+                                                                 "cut_dna/repair_dna/1kb": 0.1, "fetch_predictions": 0.4}
+    # a case threshold applies to all the sizes of the case, a case/size one only to that size and wins over it
+    overrides = {"dna2rna": 0.7, "cut_dna/repair_dna": 0.95, "fetch_predictions": 1, "dna2rna/1kb": 0.5}
+    assert bench.regressions(throughputs, baseline, 0.5, overrides) == {"dna2rna/1kb": 0.4}
+    assert bench.regressions(throughputs, {}, 0.5, {}) == {}
+
+def test_bench_suite_arguments():
+    bench = _bench_suite()
+    assert bench._case_threshold("dna2rna=0.25") == ("dna2rna", 0.25)
+    assert bench._case_threshold("cut_dna/repair_dna/1Mb=1") == ("cut_dna/repair_dna/1Mb", 1.0)
+    with pytest.raises(argparse.ArgumentTypeError, match="CASE=FRACTION"):
+        bench._case_threshold("0.5")
+    args = bench.parser().parse_args([])
+    assert args.sizes == bench.DEFAULT_SIZES and args.cases == list(bench.SEQUENCE_CASES)
+    assert args.threshold == 0.5 and args.case_threshold == [] and not args.save and not args.no_alphafold
+    args = bench.parser().parse_args(["--sizes", "1kb", "--cases", "dna2rna", "--no-alphafold", "--threshold", "0.2",
+                                      "--case-threshold", "dna2rna=0.9", "--case-threshold", "compare/1kb=0.1"])
+    assert args.sizes == ["1kb"] and args.cases == ["dna2rna"] and args.no_alphafold and args.threshold == 0.2
+    assert dict(args.case_threshold) == {"dna2rna": 0.9, "compare/1kb": 0.1}
+    with pytest.raises(SystemExit):
+        bench.parser().parse_args(["--case-threshold", "dna2rna"])